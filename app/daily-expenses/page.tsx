@@ -45,6 +45,9 @@ export default function DailyExpensesPage() {
     const { user } = useContext(AuthContext);
     const { symbol } = useContext(CurrencyContext);
     const [expenses, setExpenses] = useState<DailyExpense[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
+    const [expensesVersion, setExpensesVersion] = useState(0);
     const [categories, setCategories] = useState<DailyCategory[]>([]);
     const [stats, setStats] = useState<DailyStats | null>(null);
     const [isLoading, setIsLoading] = useState(true);
@@ -59,15 +62,13 @@ export default function DailyExpensesPage() {
     const [showAddModal, setShowAddModal] = useState(false);
     const [editingExpense, setEditingExpense] = useState<DailyExpense | undefined>(undefined);
 
-    const refresh = () => {
+    const loadSummary = () => {
         if (user) {
             Promise.all([
-                api.getDailyExpenses(user.id),
                 api.getDailyCategories(user.id),
                 api.getMonthlySalary(user.id),
                 api.getDailyStats(user.id)
-            ]).then(([expList, catList, salary, dailyStats]) => {
-                setExpenses(expList);
+            ]).then(([catList, salary, dailyStats]) => {
                 setCategories(catList);
                 setMonthlySalary(salary || 0);
                 setStats(dailyStats);
@@ -76,7 +77,41 @@ export default function DailyExpensesPage() {
         }
     };
 
-    useEffect(refresh, [user]);
+    // First page of expenses matching the search; further pages load on demand.
+    useEffect(() => {
+        if (!user) return;
+        let cancelled = false;
+        const timer = setTimeout(() => {
+            api.getDailyExpenses(user.id, { search: searchQuery }).then(page => {
+                if (cancelled) return;
+                setExpenses(page.items);
+                setNextCursor(page.nextCursor ?? null);
+            });
+        }, searchQuery ? 300 : 0);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [user, searchQuery, expensesVersion]);
+
+    const refresh = () => {
+        loadSummary();
+        setExpensesVersion(v => v + 1);
+    };
+
+    useEffect(loadSummary, [user]);
+
+    const handleLoadMore = async () => {
+        if (!user || !nextCursor) return;
+        setIsLoadingMore(true);
+        try {
+            const page = await api.getDailyExpenses(user.id, { search: searchQuery, cursor: nextCursor });
+            setExpenses(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor ?? null);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
 
     const viewStats: DailyStats = stats || {
         totalSpent: 0,
@@ -90,10 +125,6 @@ export default function DailyExpensesPage() {
         remainingSalary: 0
     };
 
-    const filteredExpenses = expenses.filter(e =>
-        e.description.toLowerCase().includes(searchQuery.toLowerCase())
-    );
-
     const handleSaveExpense = async (data: Omit<DailyExpense, 'id' | 'userId'>) => {
         if (!user) return;
         if (editingExpense) {
@@ -283,13 +314,13 @@ export default function DailyExpensesPage() {
                     </div>
 
                     <div className="space-y-4">
-                        {filteredExpenses.length === 0 ? (
+                        {expenses.length === 0 ? (
                             <div className="text-center py-20 bg-gray-50 dark:bg-gray-800/50 rounded-3xl border border-dashed border-gray-200 dark:border-gray-700">
                                 <ShoppingBag size={48} className="mx-auto text-gray-300 mb-4" />
                                 <p className="text-gray-500">No expenses found.</p>
                             </div>
                         ) : (
-                            filteredExpenses.map(expense => {
+                            expenses.map(expense => {
                                 const category = categories.find(c => c.id === expense.categoryId);
                                 const isSynced = (expense.sourceType && expense.sourceType !== 'manual') || !!expense.sourceId;
                                 const metadataItems = expense.metadata?.items || [];
@@ -377,6 +408,11 @@ export default function DailyExpensesPage() {
                             })
                         )}
                     </div>
+                    {nextCursor && (
+                        <Button variant="secondary" className="w-full py-3" onClick={handleLoadMore} isLoading={isLoadingMore}>
+                            Load more
+                        </Button>
+                    )}
                 </div>
 
                 {/* Categorical Breakdown */}
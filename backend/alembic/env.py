@@ -5,6 +5,7 @@ from alembic import context
 
 from app.core.config import settings
 from app.db.base import Base
+import app.models  # noqa: F401  (registers tables on Base.metadata)
 
 config = context.config
 
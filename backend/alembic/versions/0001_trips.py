@@ -0,0 +1,82 @@
+"""trips, participants, expenses and change logs
+
+Revision ID: 0001_trips
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001_trips"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trips",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("owner_id", sa.String(64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("icon", sa.String(64), nullable=True),
+        sa.Column("custom_image", sa.String(), nullable=True),
+        sa.Column("share_token", sa.String(64), nullable=True, unique=True),
+        sa.Column("share_permission", sa.String(8), nullable=True),
+        sa.Column("type", sa.String(16), nullable=True),
+        sa.Column("currency", sa.String(8), nullable=True),
+    )
+    op.create_index("ix_trips_owner_id", "trips", ["owner_id"])
+
+    op.create_table(
+        "participants",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("trip_id", sa.String(64), sa.ForeignKey("trips.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("user_id", sa.String(64), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_participants_trip_id", "participants", ["trip_id"])
+    op.create_index("ix_participants_user_id", "participants", ["user_id"])
+
+    op.create_table(
+        "expenses",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("trip_id", sa.String(64), sa.ForeignKey("trips.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("description", sa.String(500), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("category", sa.String(64), nullable=False),
+        sa.Column("paid_by", sa.String(64), nullable=False),
+        sa.Column("split_among", sa.JSON(), nullable=True),
+        sa.Column("is_payment", sa.Boolean(), nullable=True),
+    )
+    op.create_index("ix_expenses_trip_date", "expenses", ["trip_id", "date", "id"])
+
+    op.create_table(
+        "change_logs",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("trip_id", sa.String(64), sa.ForeignKey("trips.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("actor_name", sa.String(200), nullable=False),
+        sa.Column("action", sa.String(16), nullable=False),
+        sa.Column("item_type", sa.String(16), nullable=False),
+        sa.Column("item_id", sa.String(64), nullable=False),
+        sa.Column("description", sa.String(500), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("previous_data", sa.JSON(), nullable=True),
+        sa.Column("current_data", sa.JSON(), nullable=True),
+        sa.Column("reverted_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_change_logs_trip_timestamp", "change_logs", ["trip_id", "timestamp", "id"])
+
+
+def downgrade() -> None:
+    op.drop_table("change_logs")
+    op.drop_table("expenses")
+    op.drop_table("participants")
+    op.drop_table("trips")
@@ -0,0 +1,33 @@
+"""per-participant trip balance ledger
+
+Revision ID: 0002_trip_balances
+Revises: 0001_trips
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_trip_balances"
+down_revision = "0001_trips"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trip_balances",
+        sa.Column("trip_id", sa.String(64), sa.ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("participant_id", sa.String(64), primary_key=True),
+        sa.Column("paid", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("share", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("received", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("net", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trip_balances")
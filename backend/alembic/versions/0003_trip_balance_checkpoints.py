@@ -0,0 +1,31 @@
+"""monthly checkpoints for the daily balance series
+
+Revision ID: 0003_trip_balance_checkpoints
+Revises: 0002_trip_balances
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_trip_balance_checkpoints"
+down_revision = "0002_trip_balances"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trip_balance_checkpoints",
+        sa.Column("trip_id", sa.String(64), sa.ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("points", sa.JSON(), nullable=False),
+        sa.Column("closing", sa.JSON(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trip_balance_checkpoints")
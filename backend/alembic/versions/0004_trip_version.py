@@ -0,0 +1,25 @@
+"""trip version counter
+
+Revision ID: 0004_trip_version
+Revises: 0003_trip_balance_checkpoints
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_trip_version"
+down_revision = "0003_trip_balance_checkpoints"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("trips", sa.Column("version", sa.BigInteger(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    op.drop_column("trips", "version")
@@ -0,0 +1,27 @@
+"""batch id on imported expenses
+
+Revision ID: 0005_expense_batches
+Revises: 0004_trip_version
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_expense_batches"
+down_revision = "0004_trip_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("expenses", sa.Column("batch_id", sa.String(64), nullable=True))
+    op.create_index("ix_expenses_batch_id", "expenses", ["batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_expenses_batch_id", table_name="expenses")
+    op.drop_column("expenses", "batch_id")
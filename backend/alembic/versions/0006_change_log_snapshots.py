@@ -0,0 +1,47 @@
+"""change log sequence numbers and trip snapshots
+
+Revision ID: 0006_change_log_snapshots
+Revises: 0005_expense_batches
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_change_log_snapshots"
+down_revision = "0005_expense_batches"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("change_logs", sa.Column("seq", sa.BigInteger(), nullable=True))
+    op.execute(
+        """
+        UPDATE change_logs SET seq = ranked.seq
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY trip_id ORDER BY timestamp, id) AS seq
+            FROM change_logs
+        ) AS ranked
+        WHERE change_logs.id = ranked.id
+        """
+    )
+    op.alter_column("change_logs", "seq", nullable=False)
+    op.create_index("ix_change_logs_trip_seq", "change_logs", ["trip_id", "seq"], unique=True)
+
+    op.create_table(
+        "trip_snapshots",
+        sa.Column("trip_id", sa.String(64), sa.ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("seq", sa.BigInteger(), primary_key=True),
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trip_snapshots")
+    op.drop_index("ix_change_logs_trip_seq", table_name="change_logs")
+    op.drop_column("change_logs", "seq")
@@ -0,0 +1,58 @@
+"""daily expenses, monthly rollups and user settings
+
+Revision ID: 0007_daily_expenses
+Revises: 0006_change_log_snapshots
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_daily_expenses"
+down_revision = "0006_change_log_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_expenses",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("user_id", sa.String(64), nullable=False),
+        sa.Column("description", sa.String(500), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("category_id", sa.String(64), nullable=False),
+        sa.Column("payment_method", sa.String(32), nullable=False),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("source_id", sa.String(64), nullable=True),
+        sa.Column("source_type", sa.String(32), nullable=True),
+        sa.Column("metadata", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_daily_expenses_user_date", "daily_expenses", ["user_id", "date", "id"])
+
+    op.create_table(
+        "daily_expense_rollups",
+        sa.Column("user_id", sa.String(64), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("category_id", sa.String(64), primary_key=True),
+        sa.Column("total", sa.BigInteger(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+
+    op.create_table(
+        "user_settings",
+        sa.Column("user_id", sa.String(64), primary_key=True),
+        sa.Column("monthly_salary", sa.Numeric(14, 2), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_settings")
+    op.drop_table("daily_expense_rollups")
+    op.drop_index("ix_daily_expenses_user_date", table_name="daily_expenses")
+    op.drop_table("daily_expenses")
@@ -0,0 +1,26 @@
+"""daily expense category index for filtered listing
+
+Revision ID: 0008_daily_expense_filters
+Revises: 0007_daily_expenses
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_daily_expense_filters"
+down_revision = "0007_daily_expenses"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_daily_expenses_user_category_date", "daily_expenses", ["user_id", "category_id", "date", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_expenses_user_category_date", table_name="daily_expenses")
@@ -0,0 +1,27 @@
+"""unique synced source per daily expense
+
+Revision ID: 0009_daily_expense_sources
+Revises: 0008_daily_expense_filters
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0009_daily_expense_sources"
+down_revision = "0008_daily_expense_filters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Manual expenses have no source_id; NULLs never collide in a unique index.
+    op.create_index(
+        "uq_daily_expenses_user_source", "daily_expenses", ["user_id", "source_type", "source_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_daily_expenses_user_source", table_name="daily_expenses")
@@ -0,0 +1,52 @@
+"""recurring bills with stored next-due dates and per-user totals
+
+Revision ID: 0011_recurring_items
+Revises: 0010_jobs
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0011_recurring_items"
+down_revision = "0010_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_items",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("user_id", sa.String(64), nullable=False),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("kind", sa.String(16), nullable=False),
+        sa.Column("category", sa.String(32), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("due_day", sa.Integer(), nullable=False),
+        sa.Column("reminder_days_before", sa.Integer(), nullable=False),
+        sa.Column("auto_pay_enabled", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("next_due", sa.Date(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_recurring_items_user_next_due", "recurring_items", ["user_id", "next_due"])
+    op.create_index("ix_recurring_items_next_due", "recurring_items", ["next_due"])
+
+    op.create_table(
+        "recurring_totals",
+        sa.Column("user_id", sa.String(64), primary_key=True),
+        sa.Column("bills", sa.BigInteger(), nullable=False),
+        sa.Column("subs", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("recurring_totals")
+    op.drop_index("ix_recurring_items_next_due", table_name="recurring_items")
+    op.drop_index("ix_recurring_items_user_next_due", table_name="recurring_items")
+    op.drop_table("recurring_items")
@@ -0,0 +1,59 @@
+"""bill reminder dates, reminder records and sweep checkpoints
+
+Revision ID: 0012_bill_reminders
+Revises: 0011_recurring_items
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0012_bill_reminders"
+down_revision = "0011_recurring_items"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("recurring_items", sa.Column("next_reminder", sa.Date(), nullable=True))
+    op.execute("UPDATE recurring_items SET next_reminder = next_due - reminder_days_before")
+    op.alter_column("recurring_items", "next_reminder", nullable=False)
+    # Sweeps page through one day's items by id.
+    op.drop_index("ix_recurring_items_next_due", table_name="recurring_items")
+    op.create_index("ix_recurring_items_next_due", "recurring_items", ["next_due", "id"])
+    op.create_index("ix_recurring_items_next_reminder", "recurring_items", ["next_reminder", "id"])
+
+    op.create_table(
+        "bill_reminders",
+        sa.Column("item_id", sa.String(64), primary_key=True),
+        sa.Column("due_date", sa.Date(), primary_key=True),
+        sa.Column("kind", sa.String(16), primary_key=True),
+        sa.Column("user_id", sa.String(64), nullable=False),
+        sa.Column("remind_on", sa.Date(), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("auto_pay", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_bill_reminders_user_day", "bill_reminders", ["user_id", "remind_on"])
+
+    op.create_table(
+        "reminder_sweeps",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("phase", sa.String(16), nullable=False),
+        sa.Column("last_id", sa.String(64), nullable=False),
+        sa.Column("reminders", sa.Integer(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("reminder_sweeps")
+    op.drop_index("ix_bill_reminders_user_day", table_name="bill_reminders")
+    op.drop_table("bill_reminders")
+    op.drop_index("ix_recurring_items_next_reminder", table_name="recurring_items")
+    op.drop_index("ix_recurring_items_next_due", table_name="recurring_items")
+    op.create_index("ix_recurring_items_next_due", "recurring_items", ["next_due"])
+    op.drop_column("recurring_items", "next_reminder")
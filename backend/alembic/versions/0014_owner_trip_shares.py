@@ -0,0 +1,43 @@
+"""per-trip share of the trip owner, for /me/trip-shares and /me/stats
+
+Revision ID: 0014_owner_trip_shares
+Revises: 0013_users
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0014_owner_trip_shares"
+down_revision = "0013_users"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "owner_trip_shares",
+        sa.Column("user_id", sa.String(64), primary_key=True),
+        sa.Column("trip_id", sa.String(64), sa.ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("share", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_owner_trip_shares_trip_id", "owner_trip_shares", ["trip_id"])
+    op.execute(
+        """
+        INSERT INTO owner_trip_shares (user_id, trip_id, share)
+        SELECT t.owner_id, t.id, COALESCE((
+            SELECT SUM(b.share)
+            FROM trip_balances b JOIN participants p ON p.id = b.participant_id
+            WHERE b.trip_id = t.id AND p.user_id = t.owner_id
+        ), 0)
+        FROM trips t
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_owner_trip_shares_trip_id", table_name="owner_trip_shares")
+    op.drop_table("owner_trip_shares")
@@ -0,0 +1,24 @@
+"""index trips by owner, type and creation time for activity events
+
+Revision ID: 0015_trip_activity_index
+Revises: 0014_owner_trip_shares
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0015_trip_activity_index"
+down_revision = "0014_owner_trip_shares"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_trips_owner_type_created", "trips", ["owner_id", "type", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trips_owner_type_created", table_name="trips")
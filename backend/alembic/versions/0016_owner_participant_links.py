@@ -0,0 +1,54 @@
+"""count the owner's linked participants per trip and backfill the links
+
+Revision ID: 0016_owner_participant_links
+Revises: 0015_trip_activity_index
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0016_owner_participant_links"
+down_revision = "0015_trip_activity_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("owner_trip_shares", sa.Column("linked", sa.Integer(), nullable=False, server_default="0"))
+    # Until now nothing linked a participant to the trip owner. Link the one participant
+    # named like the owner's account, where the name is unambiguous and no link exists.
+    op.execute(
+        """
+        UPDATE participants
+        SET user_id = (SELECT t.owner_id FROM trips t WHERE t.id = participants.trip_id)
+        WHERE user_id IS NULL AND id IN (
+            SELECT p.id
+            FROM participants p JOIN trips t ON t.id = p.trip_id JOIN users u ON u.id = t.owner_id
+            WHERE LOWER(TRIM(p.name)) = LOWER(TRIM(u.name))
+            AND NOT EXISTS (SELECT 1 FROM participants o WHERE o.trip_id = p.trip_id AND o.user_id = t.owner_id)
+            AND (SELECT COUNT(*) FROM participants q WHERE q.trip_id = p.trip_id AND LOWER(TRIM(q.name)) = LOWER(TRIM(u.name))) = 1
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE owner_trip_shares
+        SET share = COALESCE((
+                SELECT SUM(b.share)
+                FROM trip_balances b JOIN participants p ON p.id = b.participant_id
+                WHERE b.trip_id = owner_trip_shares.trip_id AND p.user_id = owner_trip_shares.user_id
+            ), 0),
+            linked = (
+                SELECT COUNT(*) FROM participants p
+                WHERE p.trip_id = owner_trip_shares.trip_id AND p.user_id = owner_trip_shares.user_id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("owner_trip_shares", "linked")
@@ -1,23 +1,80 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
 from fastapi import Depends, Header, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
+from app.core import metrics
+from app.core.security import user_id_from_token
+from app.db.session import SessionLocal, note_write, reader_for
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
+def _bearer_user_id(authorization: str | None) -> str | None:
+    if not authorization:
+        return None
+    parts = authorization.split()
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        return None
+    return user_id_from_token(parts[1])
+
+
+async def get_db(authorization: str | None = Header(default=None)) -> AsyncGenerator[AsyncSession, None]:
+    """Primary session; a committed write pins the caller's reads to the primary for a short window."""
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+        user_id = _bearer_user_id(authorization)
+        if db.info.get("committed") and user_id is not None:
+            note_write(user_id)
 
 
-def get_current_user_id(authorization: str | None = Header(default=None)) -> str:
+async def get_read_db(authorization: str | None = Header(default=None)) -> AsyncGenerator[AsyncSession, None]:
+    """Session for GET routes; served from a read replica when one is configured."""
+    async with reader_for(_bearer_user_id(authorization))() as db:
+        yield db
+
+
+async def get_current_user_id(authorization: str | None = Header(default=None)) -> str:
     if not authorization:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
-        raise HTTPException(status_code=401, detail="Invalid authorization header")
-    return "me"
+    user_id = _bearer_user_id(authorization)
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return user_id
+
+
+def prefers_async(prefer: str | None = Header(default=None)) -> bool:
+    """True when the client sent ``Prefer: respond-async`` (RFC 7240) and will poll ``/jobs/{id}``."""
+    return prefer is not None and "respond-async" in [p.strip().lower() for p in prefer.split(",")]
+
+
+def accepts_gzip(accept_encoding: str | None = Header(default=None)) -> bool:
+    """True when ``Accept-Encoding`` lists ``gzip`` with a non-zero quality, for routes that compress their own stream."""
+    for part in (accept_encoding or "").split(","):
+        coding, *params = [p.strip().lower() for p in part.split(";")]
+        if coding != "gzip":
+            continue
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def query_budget(limit: int | None = None, *, allow_repeats: bool = False) -> Callable[[], Awaitable[None]]:
+    """Route dependency declaring the most SQL statements one request may issue.
+
+    Only enforced when ``QUERY_CHECKS`` is ``warn`` or ``raise``; budgets must not
+    depend on data size, so exceeding one usually means a per-row query crept in.
+    ``allow_repeats`` exempts routes that repeat a SELECT by design (e.g. per chunk).
+    """
+
+    async def declare() -> None:
+        stats = metrics.current_request.get()
+        if stats is not None:
+            stats.budget = limit
+            stats.allow_repeats = allow_repeats
+
+    return declare
@@ -0,0 +1,71 @@
+import logging
+import time
+from collections import Counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Record latency, status and SQL usage per route template, and log slow requests.
+
+    With ``QUERY_CHECKS`` set to ``warn`` or ``raise`` it also enforces the route's
+    ``query_budget`` and flags repeated SELECT statements (N+1 loads).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = metrics.RequestStats(shapes=Counter() if settings.query_checks != "off" else None)
+        token = metrics.current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.current_request.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            metrics.REQUEST_LATENCY.observe(elapsed, route=route, method=method)
+            metrics.REQUESTS.inc(route=route, method=method, status=str(status))
+            metrics.REQUEST_QUERIES.observe(stats.query_count, route=route, method=method)
+            metrics.REQUEST_QUERY_TIME.observe(stats.query_seconds, route=route, method=method)
+            if elapsed * 1000 >= settings.slow_request_ms:
+                logger.warning(
+                    "slow request %s %s: %.1f ms, %d queries in %.1f ms; slowest: %s",
+                    method,
+                    route,
+                    elapsed * 1000,
+                    stats.query_count,
+                    stats.query_seconds * 1000,
+                    "; ".join(f"{s * 1000:.1f} ms {' '.join(q.split())[:300]}" for s, q in stats.slowest_queries()) or "none",
+                )
+        if settings.query_checks != "off":
+            _check_queries(method, route, stats)
+
+
+def _check_queries(method: str, route: str, stats: metrics.RequestStats) -> None:
+    problems = stats.problems(settings.query_repeat_threshold)
+    if not problems:
+        return
+    message = f"{method} {route}: " + "; ".join(problems)
+    if settings.query_checks == "raise":
+        raise metrics.QueryBudgetExceeded(message)
+    logger.warning("query check failed for %s", message)
@@ -0,0 +1,43 @@
+import zlib
+from collections.abc import AsyncIterator, Mapping
+from typing import Any
+
+from fastapi import Response
+
+from app.core.serialization import dump_json
+from app.schemas.jobs import Job
+
+
+class ModelResponse(Response):
+    """JSON response for prebuilt pydantic models that bypasses ``response_model`` re-validation.
+
+    Routes keep declaring ``response_model`` for the OpenAPI schema; returning this
+    response makes FastAPI send the bytes as-is.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        tp: Any = None,
+        *,
+        exclude_unset: bool = False,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        super().__init__(dump_json(content, tp, exclude_unset=exclude_unset), status_code=status_code, headers=headers)
+
+
+def accepted(job: Job) -> ModelResponse:
+    """``202 Accepted`` for work handed to a background job, pointing at its status resource."""
+    return ModelResponse(job, status_code=202, headers={"Location": f"/jobs/{job.id}"})
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip a streamed body chunk by chunk; each chunk is flushed so clients can decode it on arrival."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # gzip framing
+    async for chunk in chunks:
+        if data := compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH):
+            yield data
+    yield compressor.flush()
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import activities, auth, bills, daily_expenses, dashboard, me, participants, profile, share, trips
+from app.api.routes import activities, auth, bills, daily_expenses, dashboard, jobs, me, metrics, participants, profile, share, trips
 
 api_router = APIRouter()
 
@@ -14,3 +14,5 @@ api_router.include_router(share.router, tags=["share"])
 api_router.include_router(activities.router, tags=["activities"])
 api_router.include_router(daily_expenses.router, tags=["daily-expenses"])
 api_router.include_router(bills.router, tags=["bills"])
+api_router.include_router(jobs.router, tags=["jobs"])
+api_router.include_router(metrics.router, tags=["metrics"])
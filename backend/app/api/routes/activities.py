@@ -1,23 +1,30 @@
-from datetime import datetime
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fastapi import APIRouter, Depends
-
-from app.api.deps import get_current_user_id
+from app.api.deps import get_current_user_id, get_read_db, query_budget
+from app.api.responses import ModelResponse
+from app.schemas.activities import ActivityEvents
 from app.schemas.trips import Trip
+from app.services import activities as activity_service
 
 router = APIRouter(prefix="/activities")
 
 
-@router.get("/dining/events", response_model=list[Trip])
-def get_dining_events(_user_id: str = Depends(get_current_user_id)) -> list[Trip]:
-    return []
+@router.get("/events", response_model=ActivityEvents, dependencies=[Depends(query_budget(1))])
+async def get_events(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> Response:
+    return ModelResponse(await activity_service.events(db, user_id))
+
+
+@router.get("/dining/events", response_model=list[Trip], dependencies=[Depends(query_budget(1))])
+async def get_dining_events(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> Response:
+    return ModelResponse((await activity_service.events(db, user_id)).dining, list[Trip])
 
 
-@router.get("/movies/events", response_model=list[Trip])
-def get_movies_events(_user_id: str = Depends(get_current_user_id)) -> list[Trip]:
-    return []
+@router.get("/movies/events", response_model=list[Trip], dependencies=[Depends(query_budget(1))])
+async def get_movies_events(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> Response:
+    return ModelResponse((await activity_service.events(db, user_id)).movies, list[Trip])
 
 
-@router.get("/play/events", response_model=list[Trip])
-def get_play_events(_user_id: str = Depends(get_current_user_id)) -> list[Trip]:
-    return []
+@router.get("/play/events", response_model=list[Trip], dependencies=[Depends(query_budget(1))])
+async def get_play_events(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> Response:
+    return ModelResponse((await activity_service.events(db, user_id)).play, list[Trip])
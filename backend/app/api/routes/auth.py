@@ -1,17 +1,47 @@
-from fastapi import APIRouter
+from datetime import datetime
 
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.core.security import create_access_token, hash_password, verify_password
+from app.db.base import new_id
+from app.models import users as models
 from app.schemas.auth import AuthResponse, LoginRequest, RegisterRequest, User
+from app.services import daily_expenses as daily_service
 
 router = APIRouter(prefix="/auth")
 
 
+async def _response(db: AsyncSession, user: models.User) -> AuthResponse:
+    salary = await daily_service.get_salary(db, user.id)
+    return AuthResponse(
+        user=User(id=user.id, name=user.name, email=user.email, monthly_salary=float(salary) if salary is not None else None),
+        token=create_access_token(user.id),
+    )
+
+
 @router.post("/register", response_model=AuthResponse)
-def register(payload: RegisterRequest) -> AuthResponse:
-    user = User(id="user_1", name=payload.name, email=payload.email, monthly_salary=None)
-    return AuthResponse(user=user, token="dev-token")
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db)) -> AuthResponse:
+    email = payload.email.lower()
+    if await db.scalar(select(models.User.id).where(models.User.email == email)) is not None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    user = models.User(
+        id=new_id("user"), name=payload.name, email=email, password_hash=await hash_password(payload.password), created_at=datetime.utcnow()
+    )
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError:  # registered concurrently
+        raise HTTPException(status_code=400, detail="Email already registered") from None
+    return AuthResponse(user=User(id=user.id, name=user.name, email=user.email), token=create_access_token(user.id))
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(payload: LoginRequest) -> AuthResponse:
-    user = User(id="user_1", name="Demo", email=payload.email, monthly_salary=None)
-    return AuthResponse(user=user, token="dev-token")
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)) -> AuthResponse:
+    user = await db.scalar(select(models.User).where(models.User.email == payload.email.lower()))
+    if not await verify_password(payload.password, user.password_hash if user is not None else None):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    return await _response(db, user)
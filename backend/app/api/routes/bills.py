@@ -1,49 +1,47 @@
-from datetime import date
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fastapi import APIRouter, Depends
-
-from app.api.deps import get_current_user_id
-from app.schemas.bills import CreateRecurringItemRequest, MonthlyTotals, RecurringItem, RecurringOverview, UpdateRecurringItemRequest
+from app.api.deps import get_current_user_id, get_db, get_read_db, query_budget
+from app.api.responses import ModelResponse
+from app.db.session import is_replica
+from app.schemas.bills import CreateRecurringItemRequest, RecurringItem, RecurringOverview, UpdateRecurringItemRequest
+from app.services import bills as bill_service
 
 router = APIRouter(prefix="/bills")
 
 
-@router.get("/items", response_model=list[RecurringItem])
-def list_items(_user_id: str = Depends(get_current_user_id)) -> list[RecurringItem]:
-    return []
+@router.get("/items", response_model=list[RecurringItem], dependencies=[Depends(query_budget(1))])
+async def list_items(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> list[RecurringItem]:
+    return [bill_service.to_schema(item) for item in await bill_service.list_items(db, user_id)]
 
 
 @router.post("/items", response_model=RecurringItem)
-def create_item(payload: CreateRecurringItemRequest, _user_id: str = Depends(get_current_user_id)) -> RecurringItem:
-    return RecurringItem(
-        id="ri_1",
-        user_id="me",
-        name=payload.name,
-        kind=payload.kind,
-        category=payload.category,
-        amount=payload.amount,
-        due_day=payload.due_day,
-        reminder_days_before=payload.reminder_days_before,
-        auto_pay_enabled=payload.auto_pay_enabled,
-        is_active=payload.is_active,
-        notes=payload.notes,
-    )
+async def create_item(payload: CreateRecurringItemRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> RecurringItem:
+    item = await bill_service.create_item(db, user_id, payload)
+    await db.commit()
+    return bill_service.to_schema(item)
 
 
 @router.patch("/items/{item_id}")
-def update_item(_item_id: str, _payload: UpdateRecurringItemRequest, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def update_item(
+    item_id: str, payload: UpdateRecurringItemRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)
+) -> None:
+    item = await bill_service.get_item(db, user_id, item_id)
+    await bill_service.update_item(db, item, payload)
+    await db.commit()
 
 
 @router.delete("/items/{item_id}")
-def delete_item(_item_id: str, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
-
-
-@router.get("/overview", response_model=RecurringOverview)
-def overview(_user_id: str = Depends(get_current_user_id)) -> RecurringOverview:
-    return RecurringOverview(
-        items=[],
-        monthly_totals=MonthlyTotals(bills=0.0, subs=0.0, total=0.0),
-        upcoming=[],
-    )
+async def delete_item(item_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    item = await bill_service.get_item(db, user_id, item_id)
+    await bill_service.delete_item(db, item)
+    await db.commit()
+
+
+@router.get("/overview", response_model=RecurringOverview, dependencies=[Depends(query_budget(4))])
+async def overview(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> Response:
+    persist = not is_replica(db)
+    result = await bill_service.overview(db, user_id, persist=persist)
+    if persist:
+        await db.commit()  # keep any due dates rolled forward on read
+    return ModelResponse(result)
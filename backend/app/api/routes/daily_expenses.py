@@ -1,85 +1,150 @@
-from datetime import datetime
-
-from fastapi import APIRouter, Depends
-
-from app.api.deps import get_current_user_id
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_id, get_db, get_read_db, prefers_async, query_budget
+from app.api.responses import ModelResponse, accepted
+from app.db.session import reader_for
+from app.schemas.common import Page
 from app.schemas.daily_expenses import (
     CreateDailyExpenseRequest,
     DailyCategory,
     DailyExpense,
     DailyStats,
+    PaymentMethod,
+    SourceType,
     SyncRequest,
     SyncResponse,
     UpdateDailyExpenseRequest,
 )
+from app.schemas.jobs import Job
+from app.services import daily_expenses as daily_service
+from app.services import jobs as job_service
 
 router = APIRouter(prefix="/daily-expenses")
 
 
-@router.get("", response_model=list[DailyExpense])
-def list_daily_expenses(_user_id: str = Depends(get_current_user_id)) -> list[DailyExpense]:
-    return []
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def expense_filter(
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+    category: list[str] = Query(default=[]),
+    payment_method: list[PaymentMethod] = Query(default=[], alias="paymentMethod"),
+    source_type: list[SourceType] = Query(default=[], alias="sourceType"),
+    q: str | None = Query(default=None, max_length=200, description="Case-insensitive match within the description"),
+) -> daily_service.ExpenseFilter:
+    """``from``/``to`` are inclusive calendar days; repeated list params are OR-ed."""
+    return daily_service.ExpenseFilter(
+        date_from=datetime.combine(date_from, datetime.min.time()) if date_from else None,
+        date_to=datetime.combine(date_to + timedelta(days=1), datetime.min.time()) if date_to else None,
+        category_ids=tuple(category),
+        payment_methods=tuple(payment_method),
+        source_types=tuple(source_type),
+        search=(q or "").strip() or None,
+    )
 
 
-@router.post("", response_model=DailyExpense)
-def create_daily_expense(_payload: CreateDailyExpenseRequest, _user_id: str = Depends(get_current_user_id)) -> DailyExpense:
-    return DailyExpense(
-        id="de_1",
-        user_id="me",
-        description=_payload.description,
-        amount=_payload.amount,
-        date=_payload.date,
-        category_id=_payload.category_id,
-        payment_method=_payload.payment_method,
-        notes=_payload.notes,
-        source_id=None,
-        source_type="manual",
-        metadata=None,
+@router.get("", response_model=Page[DailyExpense], dependencies=[Depends(query_budget(1))])
+async def list_daily_expenses(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    filters: daily_service.ExpenseFilter = Depends(expense_filter),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    return ModelResponse(await daily_service.page_expenses(db, user_id, filters, limit, cursor))
+
+
+@router.get("/export")
+async def export_daily_expenses(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    filters: daily_service.ExpenseFilter = Depends(expense_filter),
+    user_id: str = Depends(get_current_user_id),
+) -> StreamingResponse:
+    async def body() -> AsyncIterator[bytes]:
+        # The session is opened here rather than injected: request-scoped dependencies
+        # are closed before a streaming body is sent.
+        async with reader_for(user_id)() as db:
+            async for chunk in daily_service.export_expenses(db, user_id, filters, format):
+                yield chunk
+
+    filename = f"daily-expenses.{format}"
+    return StreamingResponse(
+        body(), media_type=EXPORT_MEDIA_TYPES[format], headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
+@router.post("", response_model=DailyExpense)
+async def create_daily_expense(
+    payload: CreateDailyExpenseRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)
+) -> DailyExpense:
+    expense = await daily_service.create_expense(db, user_id, payload)
+    await db.commit()
+    return daily_service.to_schema(expense)
+
+
 @router.patch("/{expense_id}")
-def update_daily_expense(_expense_id: str, _payload: UpdateDailyExpenseRequest, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def update_daily_expense(
+    expense_id: str, payload: UpdateDailyExpenseRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)
+) -> None:
+    expense = await daily_service.get_expense(db, user_id, expense_id)
+    await daily_service.update_expense(db, expense, payload)
+    await db.commit()
 
 
 @router.delete("/{expense_id}")
-def delete_daily_expense(_expense_id: str, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def delete_daily_expense(expense_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    expense = await daily_service.get_expense(db, user_id, expense_id)
+    await daily_service.delete_expense(db, expense)
+    await db.commit()
 
 
 @router.get("/categories", response_model=list[DailyCategory])
-def list_daily_categories(_user_id: str = Depends(get_current_user_id)) -> list[DailyCategory]:
-    return []
-
-
-@router.get("/stats", response_model=DailyStats)
-def get_daily_stats(_user_id: str = Depends(get_current_user_id)) -> DailyStats:
-    return DailyStats(
-        total_spent=0.0,
-        monthly_spent=0.0,
-        avg_daily=0.0,
-        category_breakdown={},
-        category_breakdown_items=[],
-        spent_vs_salary_percent=0.0,
-        salary_status="safe",
-        salary_message="",
-        remaining_salary=0.0,
-    )
-
-
-@router.post("/sync", response_model=SyncResponse)
-def sync_expenses(_payload: SyncRequest, _user_id: str = Depends(get_current_user_id)) -> SyncResponse:
-    return SyncResponse(count=0)
-
-
-@router.post("/unsync", response_model=SyncResponse)
-def unsync_expenses(_payload: SyncRequest, _user_id: str = Depends(get_current_user_id)) -> SyncResponse:
-    return SyncResponse(count=0)
+async def list_daily_categories(user_id: str = Depends(get_current_user_id)) -> list[DailyCategory]:
+    return daily_service.categories(user_id)
+
+
+@router.get("/stats", response_model=DailyStats, dependencies=[Depends(query_budget(3))])
+async def get_daily_stats(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> DailyStats:
+    return await daily_service.stats(db, user_id)
+
+
+@router.post("/sync", response_model=SyncResponse, responses={202: {"model": Job}})
+async def sync_expenses(
+    payload: SyncRequest,
+    run_async: bool = Depends(prefers_async),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    if run_async:
+        return accepted(job_service.to_schema(await job_service.submit(db, user_id, "daily_sync", {"sources": payload.sources})))
+    count = await daily_service.sync(db, user_id, payload.sources)
+    await db.commit()
+    return ModelResponse(SyncResponse(count=count))
+
+
+@router.post("/unsync", response_model=SyncResponse, responses={202: {"model": Job}})
+async def unsync_expenses(
+    payload: SyncRequest,
+    run_async: bool = Depends(prefers_async),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    if run_async:
+        return accepted(job_service.to_schema(await job_service.submit(db, user_id, "daily_unsync", {"sources": payload.sources})))
+    count = await daily_service.unsync(db, user_id, payload.sources)
+    await db.commit()
+    return ModelResponse(SyncResponse(count=count))
 
 
 @router.get("/__health")
-def health() -> dict:
+async def health() -> dict:
     return {"ok": True, "ts": datetime.utcnow().isoformat()}
 
 
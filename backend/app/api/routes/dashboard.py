@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user_id
+from app.api.deps import get_current_user_id, get_read_db, query_budget
 from app.schemas.me import UserStats
+from app.services import ledger
+from app.services.settlement import from_minor
 
 router = APIRouter(prefix="/me")
 
 
-@router.get("/stats", response_model=UserStats)
-def get_stats(_user_id: str = Depends(get_current_user_id)) -> UserStats:
-    return UserStats(total_tracked=0.0, trip_count=0)
+@router.get("/stats", response_model=UserStats, dependencies=[Depends(query_budget(1))])
+async def get_stats(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> UserStats:
+    trip_count, share = await ledger.owner_totals(db, user_id)
+    return UserStats(total_tracked=from_minor(share), trip_count=trip_count)
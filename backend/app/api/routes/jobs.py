@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_id, get_db, get_read_db
+from app.api.responses import ModelResponse
+from app.schemas.jobs import Job
+from app.services import jobs as job_service
+
+router = APIRouter(prefix="/jobs")
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> Response:
+    return ModelResponse(job_service.to_schema(await job_service.get_job(db, user_id, job_id)))
+
+
+@router.post("/{job_id}/cancel", response_model=Job)
+async def cancel_job(job_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> Response:
+    job = await job_service.get_job(db, user_id, job_id)
+    await job_service.cancel(db, job)
+    await db.commit()
+    await db.refresh(job)
+    return ModelResponse(job_service.to_schema(job))
+
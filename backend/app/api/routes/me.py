@@ -1,21 +1,27 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user_id
+from app.api.deps import get_current_user_id, get_db, get_read_db, query_budget
 from app.schemas.daily_expenses import SalaryResponse, UpdateSalaryRequest
+from app.services import daily_expenses as daily_service
+from app.services import ledger
+from app.services.settlement import from_minor
 
 router = APIRouter(prefix="/me")
 
 
 @router.get("/salary", response_model=SalaryResponse)
-def get_salary(_user_id: str = Depends(get_current_user_id)) -> SalaryResponse:
-    return SalaryResponse(monthly_salary=None)
+async def get_salary(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> SalaryResponse:
+    salary = await daily_service.get_salary(db, user_id)
+    return SalaryResponse(monthly_salary=float(salary) if salary is not None else None)
 
 
 @router.put("/salary")
-def update_salary(_payload: UpdateSalaryRequest, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def update_salary(payload: UpdateSalaryRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    await daily_service.set_salary(db, user_id, payload.monthly_salary)
+    await db.commit()
 
 
-@router.get("/trip-shares", response_model=dict[str, float])
-def get_trip_shares(_user_id: str = Depends(get_current_user_id)) -> dict[str, float]:
-    return {}
+@router.get("/trip-shares", response_model=dict[str, float], dependencies=[Depends(query_budget(1))])
+async def get_trip_shares(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> dict[str, float]:
+    return {trip_id: from_minor(share) for trip_id, share in (await ledger.owner_shares(db, user_id)).items()}
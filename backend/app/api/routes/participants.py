@@ -1,10 +1,25 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user_id
+from app.api.deps import get_current_user_id, get_db
+from app.services import trips as trip_service
 
 router = APIRouter(prefix="/participants")
 
 
 @router.patch("/{participant_id}")
-def update_participant(_participant_id: str, _payload: dict, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def update_participant(participant_id: str, payload: dict, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    participant = await trip_service.get_participant(db, participant_id)
+    trip = await trip_service.get_trip_for_user(db, participant.trip_id, user_id)
+    previous = trip_service.participant_snapshot(participant)
+    participant.name = str(payload.get("name") or participant.name)
+    if "isMe" in payload:
+        await trip_service.link_participant(db, participant, user_id if payload["isMe"] else None)
+    renamed = previous["name"] != participant.name
+    await trip_service.record_log(
+        db, participant.trip_id, trip_service.actor_name(payload.get("actor")), "update", "participant", participant_id,
+        f"Renamed {previous['name']} to {participant.name}" if renamed else f"Updated {participant.name}",
+        previous, trip_service.participant_snapshot(participant),
+    )
+    trip_service.bump_version(trip)
+    await db.commit()
@@ -1,11 +1,34 @@
+from collections.abc import AsyncIterator
+from typing import Literal
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_current_user_id
+from app.api.deps import accepts_gzip, get_current_user_id
+from app.api.responses import gzip_stream
+from app.db.session import reader_for
 from app.schemas.me import UserProfileData
+from app.services import profile as profile_service
 
 router = APIRouter(prefix="/me")
 
+PROFILE_MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
 
 @router.get("/profile", response_model=UserProfileData)
-def get_profile(_user_id: str = Depends(get_current_user_id)) -> UserProfileData:
-    return UserProfileData(trips=[], expenses=[])
+async def get_profile(
+    format: Literal["json", "ndjson"] = "json",
+    gzip: bool = Depends(accepts_gzip),
+    user_id: str = Depends(get_current_user_id),
+) -> StreamingResponse:
+    async def body() -> AsyncIterator[bytes]:
+        # Opened here rather than injected: request-scoped dependencies are closed
+        # before a streaming body is sent.
+        async with reader_for(user_id)() as db:
+            async for chunk in profile_service.export_profile(db, user_id, format):
+                yield chunk
+
+    headers = {"Vary": "Accept-Encoding"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(gzip_stream(body()) if gzip else body(), media_type=PROFILE_MEDIA_TYPES[format], headers=headers)
@@ -1,26 +1,25 @@
-from datetime import datetime
-
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.caching import is_not_modified, make_etag, not_modified
+from app.api.deps import get_read_db, query_budget
 from app.schemas.share import ShareTripResponse
-from app.schemas.trips import Participant, Trip
+from app.services import share as share_service
 
 router = APIRouter(prefix="/share")
 
 
-@router.get("/{token}", response_model=ShareTripResponse)
-def get_trip_by_share_token(token: str) -> ShareTripResponse:
-    trip = Trip(
-        id=f"shared_{token}",
-        name="Shared Trip",
-        owner_id="user_1",
-        created_at=datetime.utcnow(),
-        icon="plane",
-        custom_image=None,
-        share_token=token,
-        share_permission="view",
-        type="trip",
-    )
+@router.get("/{token}", response_model=ShareTripResponse, dependencies=[Depends(query_budget(2))])
+async def get_trip_by_share_token(token: str, request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
+    rendered = share_service.cached(token) or await share_service.render(db, token)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Share link not found")
 
-    participants = [Participant(id="p1", trip_id=trip.id, name="Guest")]
-    return ShareTripResponse(trip=trip, participants=participants)
+    etag = make_etag(rendered.trip_id, rendered.version, token)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=rendered.body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "public, no-cache"},
+    )
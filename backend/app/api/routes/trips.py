@@ -1,37 +1,54 @@
 from datetime import datetime
-
-from fastapi import APIRouter, Depends
-
-from app.api.deps import get_current_user_id
+from secrets import token_urlsafe
+from typing import get_args
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.caching import is_not_modified, make_etag, not_modified
+from app.api.deps import get_current_user_id, get_db, get_read_db, prefers_async, query_budget
+from app.api.responses import ModelResponse, accepted
+from app.core.serialization import validate
+from app.db.base import new_id
+from app.db.session import is_replica
+from app.models import trips as models
+from app.schemas.common import ChangeLog, Page
 from app.schemas.trips import (
-    AnalyticsData,
+    BatchImportResponse,
     CreateParticipantRequest,
     CreateShareLinkRequest,
     CreateShareLinkResponse,
     CreateTripRequest,
     Expense,
+    ExpenseFields,
     Participant,
-    SettlementSummary,
     Trip,
     TripDetailsView,
+    TripViewSection,
     UpdateExpenseRequest,
     UpdateTripRequest,
 )
+from app.schemas.jobs import Job
+from app.services import expense_import
+from app.services import jobs as job_service
+from app.services import trips as trip_service
 
 router = APIRouter(prefix="/trips")
 
 
-@router.get("", response_model=list[Trip])
-def list_trips(_user_id: str = Depends(get_current_user_id)) -> list[Trip]:
-    return []
+@router.get("", response_model=list[Trip], dependencies=[Depends(query_budget(1))])
+async def list_trips(user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_read_db)) -> Response:
+    stmt = select(models.Trip).where(models.Trip.owner_id == user_id).order_by(models.Trip.created_at.desc())
+    return ModelResponse(validate(list[Trip], list(await db.scalars(stmt))), list[Trip])
 
 
 @router.post("", response_model=Trip)
-def create_trip(payload: CreateTripRequest, _user_id: str = Depends(get_current_user_id)) -> Trip:
-    return Trip(
-        id="trip_1",
+async def create_trip(payload: CreateTripRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> models.Trip:
+    trip = models.Trip(
+        id=new_id("trip"),
         name=payload.name,
-        owner_id="user_1",
+        owner_id=user_id,
         created_at=datetime.utcnow(),
         icon=payload.icon,
         custom_image=payload.custom_image,
@@ -39,105 +56,240 @@ def create_trip(payload: CreateTripRequest, _user_id: str = Depends(get_current_
         type=payload.type,
         currency=payload.currency,
     )
+    db.add(trip)
+    db.add(models.OwnerTripShare(user_id=user_id, trip_id=trip.id, share=0, linked=0))
+    trip_service.mark_changed(db, trip)
+    await db.commit()
+    return trip
 
 
 @router.patch("/{trip_id}")
-def update_trip(_trip_id: str, _payload: UpdateTripRequest, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def update_trip(trip_id: str, payload: UpdateTripRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    for key, value in payload.model_dump(exclude_unset=True).items():
+        setattr(trip, key, value)
+    trip_service.bump_version(trip)
+    await db.commit()
 
 
 @router.delete("/{trip_id}")
-def delete_trip(_trip_id: str, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
-
-
-@router.get("/{trip_id}/view", response_model=TripDetailsView)
-def trip_view(trip_id: str, _user_id: str = Depends(get_current_user_id)) -> TripDetailsView:
-    trip = Trip(
-        id=trip_id,
-        name="Trip",
-        owner_id="user_1",
-        created_at=datetime.utcnow(),
-        icon="plane",
-        custom_image=None,
-        share_token=None,
-        share_permission=None,
-        type="trip",
-        currency="INR",
-    )
-
-    settlement_data = SettlementSummary(settlements=[], stats={}, balances={})
-
-    analytics = AnalyticsData(
-        participant_stats=[],
-        daily_stats=[],
-        category_stats=[],
-        total_trip_cost=0.0,
-        total_payer_stats=[],
-        individual_share_stats=[],
-    )
-
-    return TripDetailsView(
-        trip=trip,
-        participants=[],
-        expenses=[],
-        logs=[],
-        settlement_data=settlement_data,
-        daily_balances=[],
-        grouped_expenses=[],
-        analytics_data=analytics,
-        user_share=0.0,
-        share_token=trip.share_token,
-        share_permission=trip.share_permission,
-    )
+async def delete_trip(trip_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    trip_service.mark_changed(db, trip)
+    await db.delete(trip)
+    await db.commit()
+
+
+@router.get(
+    "/{trip_id}/view",
+    response_model=TripDetailsView,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(query_budget(8))],  # 7 reads, plus a version check before storing checkpoints
+)
+async def trip_view(
+    trip_id: str,
+    request: Request,
+    include: str | None = Query(default=None, description="Comma-separated sections, e.g. participants,expenses"),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    sections = None
+    if include is not None:
+        sections = {s.strip() for s in include.split(",") if s.strip()}
+        unknown = sections - set(get_args(TripViewSection))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown view sections: {', '.join(sorted(unknown))}")
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+
+    etag = make_etag(trip.id, trip.version, user_id, ",".join(sorted(sections)) if sections is not None else "*")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    view = await trip_service.build_view(db, trip, user_id, sections)
+    if not is_replica(db):
+        await db.commit()  # persist any refreshed daily-balance checkpoints
+    return ModelResponse(view, exclude_unset=True, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+
+@router.get("/{trip_id}/expenses", response_model=Page[Expense], dependencies=[Depends(query_budget(2))])
+async def list_expenses(
+    trip_id: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    await trip_service.get_trip_for_user(db, trip_id, user_id)
+    return ModelResponse(await trip_service.page_expenses(db, trip_id, limit, cursor))
+
+
+@router.get("/{trip_id}/logs", response_model=Page[ChangeLog], dependencies=[Depends(query_budget(2))])
+async def list_logs(
+    trip_id: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    await trip_service.get_trip_for_user(db, trip_id, user_id)
+    return ModelResponse(await trip_service.page_logs(db, trip_id, limit, cursor))
 
 
 @router.post("/logs/{log_id}/revert")
-def revert_log(_log_id: str, _user_id: str = Depends(get_current_user_id)) -> None:
+async def revert_log(log_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    log = await db.get(models.ChangeLog, log_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Log not found")
+    trip = await trip_service.get_trip_for_user(db, log.trip_id, user_id)
+    await trip_service.revert(db, log, trip_service.actor_name(None))
+    trip_service.bump_version(trip)
+    await db.commit()
+
+
+@router.post("/{trip_id}/revert-all", response_model=None, responses={202: {"model": Job}})
+async def revert_all(
+    trip_id: str,
+    before: str | None = Query(default=None, description="Log id to roll back to (inclusive); defaults to the first change"),
+    run_async: bool = Depends(prefers_async),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> Response | None:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    before_log = None
+    if before is not None:
+        before_log = await db.get(models.ChangeLog, before)
+        if before_log is None or before_log.trip_id != trip_id:
+            raise HTTPException(status_code=404, detail="Log not found")
+    if run_async:
+        params = {"tripId": trip_id, "before": before, "actor": trip_service.actor_name(None)}
+        return accepted(job_service.to_schema(await job_service.submit(db, user_id, "revert_all", params)))
+    await trip_service.revert_all(db, trip, trip_service.actor_name(None), before_log)
+    trip_service.bump_version(trip)
+    await db.commit()
     return None
 
 
-@router.post("/{trip_id}/revert-all")
-def revert_all(_trip_id: str, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+@router.post("/{trip_id}/ledger:rebuild", status_code=202, response_model=Job)
+async def rebuild_ledger(trip_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> Response:
+    """Recompute the trip's balance ledger from its expenses in a background job."""
+    await trip_service.get_trip_for_user(db, trip_id, user_id)
+    return accepted(job_service.to_schema(await job_service.submit(db, user_id, "ledger_rebuild", {"tripIds": [trip_id]})))
 
 
 @router.post("/{trip_id}/share", response_model=CreateShareLinkResponse)
-def create_share_link(_trip_id: str, _payload: CreateShareLinkRequest, _user_id: str = Depends(get_current_user_id)) -> CreateShareLinkResponse:
-    return CreateShareLinkResponse(token="share-token")
+async def create_share_link(trip_id: str, payload: CreateShareLinkRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> CreateShareLinkResponse:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    if trip.share_token is None:
+        trip.share_token = token_urlsafe(16)
+    trip.share_permission = payload.permission
+    trip_service.bump_version(trip)
+    await db.commit()
+    return CreateShareLinkResponse(token=trip.share_token)
 
 
 @router.post("/{trip_id}/participants", response_model=Participant)
-def add_participant(trip_id: str, payload: CreateParticipantRequest, _user_id: str = Depends(get_current_user_id)) -> Participant:
-    return Participant(id="p_1", trip_id=trip_id, name=payload.name)
+async def add_participant(trip_id: str, payload: CreateParticipantRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> models.Participant:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    participant = models.Participant(id=new_id("p"), trip_id=trip_id, name=payload.name)
+    db.add(participant)
+    await trip_service.link_participant(db, participant, user_id if payload.is_me else None)
+    await trip_service.record_log(
+        db, trip_id, trip_service.actor_name(None), "add", "participant", participant.id,
+        f"Added participant {participant.name}", None, trip_service.participant_snapshot(participant),
+    )
+    trip_service.bump_version(trip)
+    await db.commit()
+    return participant
 
 
 @router.delete("/{trip_id}/participants/{participant_id}")
-def remove_participant(_trip_id: str, _participant_id: str, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def remove_participant(trip_id: str, participant_id: str, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    participant = await trip_service.get_participant(db, participant_id)
+    if participant.trip_id != trip_id:
+        raise HTTPException(status_code=404, detail="Participant not found")
+    previous = trip_service.participant_snapshot(participant)
+    previous["expenses"] = await trip_service.remove_participant(db, participant)
+    await trip_service.record_log(
+        db, trip_id, trip_service.actor_name(None), "delete", "participant", participant_id,
+        f"Removed participant {participant.name}", previous, None,
+    )
+    trip_service.bump_version(trip)
+    await db.commit()
 
 
 @router.post("/{trip_id}/expenses", response_model=Expense)
-def add_expense(trip_id: str, payload: dict, _user_id: str = Depends(get_current_user_id)) -> Expense:
-    expense = payload.get("expense", {})
-    return Expense(
-        id="e_1",
-        trip_id=trip_id,
-        description=str(expense.get("description", "Expense")),
-        amount=float(expense.get("amount", 0)),
-        date=datetime.utcnow(),
-        category=str(expense.get("category", "Others")),
-        paid_by=str(expense.get("paidBy", "")),
-        split_among=expense.get("splitAmong") or [],
-        is_payment=bool(expense.get("isPayment")) if "isPayment" in expense else None,
+async def add_expense(trip_id: str, payload: dict, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> models.Expense:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    fields = ExpenseFields.model_validate(payload.get("expense", {}))
+    expense = await trip_service.insert_expense(db, trip_id, fields)
+    await db.flush()
+    await trip_service.record_log(
+        db, trip_id, trip_service.actor_name(payload.get("actor")), "add", "expense", expense.id,
+        f"Added {expense.description}", None, trip_service.expense_snapshot(expense),
     )
+    trip_service.bump_version(trip)
+    await db.commit()
+    return expense
+
+
+@router.post(
+    "/{trip_id}/expenses:batch",
+    response_model=BatchImportResponse,
+    responses={202: {"model": Job}},
+    dependencies=[Depends(query_budget(allow_repeats=True))],  # one ledger read per chunk
+)
+async def import_expenses(
+    trip_id: str,
+    request: Request,
+    actor: str | None = Query(default=None),
+    run_async: bool = Depends(prefers_async),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> BatchImportResponse | Response:
+    """Import expenses from a streamed ``text/csv`` (header row required) or ``application/x-ndjson`` body.
+
+    With ``Prefer: respond-async`` the body is spooled to disk and imported by a background job.
+    """
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    actor = actor or trip_service.actor_name(None)
+    content_type = request.headers.get("content-type")
+    if run_async:
+        params = {"tripId": trip_id, "actor": actor, "contentType": content_type, "upload": await job_service.spool(request.stream())}
+        return accepted(job_service.to_schema(await job_service.submit(db, user_id, "expense_import", params)))
+    return await expense_import.run(db, trip, request.stream(), content_type, actor)
 
 
 @router.patch("/{trip_id}/expenses/{expense_id}")
-def update_expense(_trip_id: str, _expense_id: str, _payload: UpdateExpenseRequest, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def update_expense(trip_id: str, expense_id: str, payload: UpdateExpenseRequest, user_id: str = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)) -> None:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    expense = await trip_service.get_expense(db, trip_id, expense_id)
+    previous = trip_service.expense_snapshot(expense)
+    await trip_service.update_expense(db, expense, ExpenseFields.model_validate(payload.data))
+    await db.flush()
+    await trip_service.record_log(
+        db, trip_id, trip_service.actor_name(payload.actor), "update", "expense", expense_id,
+        f"Updated {expense.description}", previous, trip_service.expense_snapshot(expense),
+    )
+    trip_service.bump_version(trip)
+    await db.commit()
 
 
 @router.delete("/{trip_id}/expenses/{expense_id}")
-def delete_expense(_trip_id: str, _expense_id: str, _user_id: str = Depends(get_current_user_id)) -> None:
-    return None
+async def delete_expense(
+    trip_id: str,
+    expense_id: str,
+    payload: dict | None = Body(default=None),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    trip = await trip_service.get_trip_for_user(db, trip_id, user_id)
+    expense = await trip_service.get_expense(db, trip_id, expense_id)
+    previous = trip_service.expense_snapshot(expense)
+    await trip_service.delete_expense(db, expense)
+    await trip_service.record_log(
+        db, trip_id, trip_service.actor_name((payload or {}).get("actor")), "delete", "expense", expense_id,
+        f"Deleted {previous['description']}", previous, None,
+    )
+    trip_service.bump_version(trip)
+    await db.commit()
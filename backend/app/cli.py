@@ -0,0 +1,132 @@
+"""Maintenance commands.
+
+Usage::
+
+    python -m app.cli ledger verify [--trip-id ID]
+    python -m app.cli ledger rebuild [--trip-id ID]
+    python -m app.cli rollups rebuild [--user-id ID]
+    python -m app.cli bills rollover [--date YYYY-MM-DD]
+    python -m app.cli bills sweep [--date YYYY-MM-DD]
+    python -m app.cli bills totals [--user-id ID]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from datetime import date, datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import SessionLocal
+from app.models import bills as bill_models
+from app.models import daily_expenses as daily_models
+from app.models import trips as models
+from app.services import bills, daily_expenses, ledger, reminders
+from app.services.settlement import from_minor
+
+
+async def _trip_ids(db: AsyncSession, trip_id: str | None) -> list[str]:
+    if trip_id:
+        return [trip_id]
+    return list(await db.scalars(select(models.Trip.id).order_by(models.Trip.id)))
+
+
+async def ledger_command(args: argparse.Namespace) -> int:
+    drifted = 0
+    async with SessionLocal() as db:
+        for trip_id in await _trip_ids(db, args.trip_id):
+            drift = await ledger.rebuild(db, trip_id) if args.action == "rebuild" else await ledger.verify(db, trip_id)
+            for d in drift:
+                print(
+                    f"{d.trip_id} {d.participant_id}: stored net {from_minor(d.stored.net):.2f}, "
+                    f"expected {from_minor(d.expected.net):.2f}"
+                )
+            drifted += bool(drift)
+            if args.action == "rebuild":
+                await db.commit()
+    print(f"{drifted} trip(s) with drift")
+    return 1 if drifted and args.action == "verify" else 0
+
+
+async def _user_ids(db: AsyncSession, user_id: str | None) -> list[str]:
+    if user_id:
+        return [user_id]
+    expense_users = select(daily_models.DailyExpense.user_id)
+    rollup_users = select(daily_models.DailyExpenseRollup.user_id)
+    return sorted(set(await db.scalars(expense_users.distinct())) | set(await db.scalars(rollup_users.distinct())))
+
+
+async def rollups_command(args: argparse.Namespace) -> int:
+    fixed = 0
+    async with SessionLocal() as db:
+        for user_id in await _user_ids(db, args.user_id):
+            wrong = await daily_expenses.rebuild_rollups(db, user_id)
+            if wrong:
+                print(f"{user_id}: {wrong} rollup row(s) corrected")
+            fixed += bool(wrong)
+            await db.commit()
+    print(f"{fixed} user(s) with stale rollups")
+    return 0
+
+
+async def _rollover(db: AsyncSession, today: date) -> int:
+    rolled = 0
+    while batch := await bills.rollover(db, today):
+        await db.commit()
+        rolled += batch
+    return rolled
+
+
+async def bills_command(args: argparse.Namespace) -> int:
+    today = args.date or datetime.utcnow().date()
+    async with SessionLocal() as db:
+        if args.action == "rollover":
+            rolled = await _rollover(db, today)
+            print(f"{rolled} due date(s) rolled forward to {today.isoformat()} or later")
+            return 0
+        if args.action == "sweep":
+            await _rollover(db, today)
+            while await reminders.sweep_batch(db, today):
+                await db.commit()
+            await db.commit()
+            sweep = await db.get(bill_models.ReminderSweep, today)
+            print(f"{sweep.reminders} reminder(s) recorded for {today.isoformat()}")
+            return 0
+        user_ids = [args.user_id] if args.user_id else list(await db.scalars(select(bill_models.RecurringItem.user_id).distinct()))
+        fixed = 0
+        for user_id in sorted(user_ids):
+            fixed += await bills.rebuild_totals(db, user_id)
+            await db.commit()
+    print(f"{fixed} user(s) with stale bill totals")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ledger_parser = commands.add_parser("ledger", help="verify or rebuild the per-trip balance ledger")
+    ledger_parser.add_argument("action", choices=["verify", "rebuild"])
+    ledger_parser.add_argument("--trip-id")
+    ledger_parser.set_defaults(func=ledger_command)
+
+    rollups_parser = commands.add_parser("rollups", help="rebuild the monthly daily-expense rollups")
+    rollups_parser.add_argument("action", choices=["rebuild"])
+    rollups_parser.add_argument("--user-id")
+    rollups_parser.set_defaults(func=rollups_command)
+
+    bills_parser = commands.add_parser("bills", help="daily due-date rollover and reminder sweep, or rebuild totals")
+    bills_parser.add_argument("action", choices=["rollover", "sweep", "totals"])
+    bills_parser.add_argument("--date", type=date.fromisoformat, help="treat this as today (rollover, sweep)")
+    bills_parser.add_argument("--user-id")
+    bills_parser.set_defaults(func=bills_command)
+
+    args = parser.parse_args(argv)
+    return asyncio.run(args.func(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""In-process request and database metrics in the Prometheus text format.
+
+Counters and histograms live in a module-level registry; ``render`` produces the
+exposition served at ``/metrics``. Per-request SQL statistics are collected into the
+``RequestStats`` held by ``current_request`` (set by ``MetricsMiddleware``) from the
+engine events registered in ``app.db.session``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import Counter as _Tally
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+SLOWEST_QUERIES_KEPT = 5
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = [*labels, extra] if extra else list(labels)
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()])
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation)
+        self.buckets = buckets
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts, totals = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            totals[0] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted((k, (list(c), t[0])) for k, (c, t) in self._values.items())
+        lines = []
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip([*self.buckets, float("inf")], counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+_registry: list[_Metric] = []
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Request latency by route template.")
+REQUESTS = Counter("http_requests_total", "Requests by route template and status code.")
+REQUEST_QUERIES = Histogram("http_request_db_queries", "SQL statements issued per request.", COUNT_BUCKETS)
+REQUEST_QUERY_TIME = Histogram("http_request_db_seconds", "Total SQL execution time per request.")
+QUERIES = Counter("db_queries_total", "SQL statements executed.")
+POOL_CHECKOUT_WAIT = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.")
+JOBS = Counter("jobs_total", "Background jobs finished, by kind and final status.")
+JOB_DURATION = Histogram("job_duration_seconds", "Background job run time by kind.")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in ``QUERY_CHECKS=raise`` mode when a request breaks its query budget or repeats a SELECT."""
+
+
+@dataclass(slots=True)
+class RequestStats:
+    query_count: int = 0
+    query_seconds: float = 0.0
+    slowest: list[tuple[float, int, str]] = field(default_factory=list)
+    budget: int | None = None
+    allow_repeats: bool = False
+    shapes: _Tally[str] | None = None  # only tracked when query checks are on
+
+    def record_query(self, seconds: float, statement: str) -> None:
+        self.query_count += 1
+        self.query_seconds += seconds
+        if self.shapes is not None and statement.lstrip()[:6].upper() == "SELECT":
+            self.shapes[statement] += 1
+        entry = (seconds, self.query_count, statement)
+        if len(self.slowest) < SLOWEST_QUERIES_KEPT:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def slowest_queries(self) -> list[tuple[float, str]]:
+        return [(seconds, statement) for seconds, _, statement in sorted(self.slowest, reverse=True)]
+
+    def problems(self, repeat_threshold: int) -> list[str]:
+        """Budget overruns and SELECTs issued ``repeat_threshold`` or more times (likely N+1)."""
+        found = []
+        if self.budget is not None and self.query_count > self.budget:
+            found.append(f"{self.query_count} queries exceeds the budget of {self.budget}")
+        for statement, count in ({} if self.allow_repeats else self.shapes or {}).items():
+            if count >= repeat_threshold:
+                found.append(f"same SELECT issued {count} times: {' '.join(statement.split())[:300]}")
+        return found
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def record_query(seconds: float, statement: str) -> None:
+    QUERIES.inc()
+    stats = current_request.get()
+    if stats is not None:
+        stats.record_query(seconds, statement)
@@ -0,0 +1,63 @@
+"""Password hashing and access tokens.
+
+bcrypt is deliberately slow, so hashing and verification run in a small dedicated
+thread pool: a burst of logins queues there instead of stalling the event loop or
+starving the default executor. Verified token claims are cached by the token's
+SHA-256, so authenticated requests skip the signature check until the cache entry
+or the token expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_passwords = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_hash_pool = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt")
+_verified: TTLCache[str, tuple[str, float]] = TTLCache(settings.token_cache_size, settings.token_cache_ttl_seconds)
+
+# Compared against when the email is unknown, so a miss costs as much as a wrong password.
+_DUMMY_HASH = _passwords.hash("not-a-real-password")
+
+
+async def hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, _passwords.hash, password)
+
+
+async def verify_password(password: str, password_hash: str | None) -> bool:
+    loop = asyncio.get_running_loop()
+    ok = await loop.run_in_executor(_hash_pool, _passwords.verify, password, password_hash or _DUMMY_HASH)
+    return ok and password_hash is not None
+
+
+def create_access_token(user_id: str) -> str:
+    now = datetime.now(timezone.utc)
+    claims = {"sub": user_id, "iat": now, "exp": now + timedelta(minutes=settings.access_token_expire_minutes)}
+    return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+
+
+def user_id_from_token(token: str) -> str | None:
+    """The token's subject if it is validly signed and unexpired, else None."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    cached = _verified.get(key)
+    if cached is not None:
+        user_id, expires_at = cached
+        return user_id if expires_at > time.time() else None
+    try:
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return None
+    user_id, expires_at = claims.get("sub"), claims.get("exp")
+    if not isinstance(user_id, str) or not isinstance(expires_at, (int, float)):
+        return None
+    _verified.set(key, (user_id, float(expires_at)))
+    return user_id
@@ -0,0 +1,28 @@
+"""Single-pass JSON serialization for response models.
+
+``TypeAdapter`` construction builds a pydantic-core serializer, so adapters are cached
+per type and reused; ``dump_json`` then writes straight to bytes in Rust without the
+intermediate dict FastAPI's ``response_model`` path produces and re-validates.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter(tp: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(tp)
+
+
+def dump_json(content: Any, tp: Any = None, *, exclude_unset: bool = False) -> bytes:
+    """Serialize already-built models (or ``tp``-shaped data) to camelCase JSON bytes."""
+    return adapter(tp if tp is not None else type(content)).dump_json(content, by_alias=True, exclude_unset=exclude_unset)
+
+
+def validate(tp: Any, data: Any) -> Any:
+    """Build ``tp`` from ORM rows / attribute objects, once, before ``dump_json``."""
+    return adapter(tp).validate_python(data, from_attributes=True)
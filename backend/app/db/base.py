@@ -1,5 +1,20 @@
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+def new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid4().hex}"
+
+
+def insert_for(db: AsyncSession, model: Any) -> postgresql.Insert | sqlite.Insert:
+    """``INSERT`` into ``model`` in the session's dialect, which supports ``on_conflict_do_*``."""
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
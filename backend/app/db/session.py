@@ -1,14 +1,104 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import time
+from itertools import cycle
+from typing import Any
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def _engine_options(url: str) -> dict[str, Any]:
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "connect_args": {
+            "connect_timeout": settings.db_connect_timeout_seconds,
+            "options": f"-c statement_timeout={settings.db_statement_timeout_ms}",
+        },
+    }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    metrics.record_query(time.perf_counter() - conn.info["query_started"].pop(), statement)
+
+
+def _discard_failed_query(context) -> None:
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _instrument(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _discard_failed_query)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(url, pool_pre_ping=True, **_engine_options(url))
+    _instrument(engine.sync_engine)
+    return engine
+
+
 try:
-    engine = create_engine(settings.database_url, pool_pre_ping=True)
+    engine = _create_engine(settings.database_url)
+    replica_engines = [_create_engine(url) for url in settings.database_replica_urls_list]
 except ModuleNotFoundError as e:
     if str(e) == "No module named 'psycopg'":
         raise RuntimeError(
             "Database driver 'psycopg' is not installed. Install backend dependencies: pip install -r requirements.txt"
         ) from e
     raise
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+ReplicaSessionLocals = [
+    async_sessionmaker(replica, autoflush=False, expire_on_commit=False, info={"replica": True}) for replica in replica_engines
+]
+_replicas = cycle(ReplicaSessionLocals)
+_recent_writers: TTLCache[str, bool] = TTLCache(maxsize=100_000, ttl=settings.replica_stickiness_seconds)
+
+
+def reader_for(user_id: str | None) -> async_sessionmaker[AsyncSession]:
+    """Session factory for a read-only request: a replica, unless the user wrote recently."""
+    if not ReplicaSessionLocals or (user_id is not None and _recent_writers.get(user_id)):
+        return SessionLocal
+    return next(_replicas)
+
+
+def note_write(user_id: str) -> None:
+    """Pin ``user_id``'s reads to the primary for ``replica_stickiness_seconds``."""
+    _recent_writers.set(user_id, True)
+
+
+def is_replica(db: AsyncSession) -> bool:
+    return bool(db.info.get("replica"))
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_commit(session: Session) -> None:
+    session.info["committed"] = True
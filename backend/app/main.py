@@ -1,10 +1,23 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.middleware import MetricsMiddleware
 from app.api.router import api_router
 from app.core.config import settings
+from app.services import jobs
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await jobs.runner.start(settings.job_workers)
+    yield
+    await jobs.runner.stop()
 
-app = FastAPI(title="SmartSplit API")
+
+app = FastAPI(title="SmartSplit API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,4 +27,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router)
@@ -0,0 +1,3 @@
+from app.models import bills, daily_expenses, jobs, trips, users
+
+__all__ = ["bills", "daily_expenses", "jobs", "trips", "users"]
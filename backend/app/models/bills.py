@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RecurringItem(Base):
+    __tablename__ = "recurring_items"
+    __table_args__ = (
+        Index("ix_recurring_items_user_next_due", "user_id", "next_due"),
+        Index("ix_recurring_items_next_due", "next_due", "id"),
+        Index("ix_recurring_items_next_reminder", "next_reminder", "id"),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64))
+    name: Mapped[str] = mapped_column(String(200))
+    kind: Mapped[str] = mapped_column(String(16))
+    category: Mapped[str] = mapped_column(String(32))
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    due_day: Mapped[int] = mapped_column(Integer)
+    reminder_days_before: Mapped[int] = mapped_column(Integer)
+    auto_pay_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    notes: Mapped[str | None] = mapped_column(String, nullable=True)
+    # The next date on or after "today" matching ``due_day``; rolled forward once it passes.
+    next_due: Mapped[date] = mapped_column(Date)
+    next_reminder: Mapped[date] = mapped_column(Date)  # next_due - reminder_days_before
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class RecurringTotals(Base):
+    """Per-user monthly sums (minor units) of active bills and subscriptions."""
+
+    __tablename__ = "recurring_totals"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    bills: Mapped[int] = mapped_column(BigInteger, default=0)
+    subs: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class BillReminder(Base):
+    """One reminder (``kind`` "reminder" or "due") per item and due date; written by the daily sweep."""
+
+    __tablename__ = "bill_reminders"
+    __table_args__ = (Index("ix_bill_reminders_user_day", "user_id", "remind_on"),)
+
+    item_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    due_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64))
+    remind_on: Mapped[date] = mapped_column(Date)
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    auto_pay: Mapped[bool] = mapped_column(Boolean)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ReminderSweep(Base):
+    """Per-day sweep checkpoint: the phase in progress, the last item id it finished and reminders recorded."""
+
+    __tablename__ = "reminder_sweeps"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    phase: Mapped[str] = mapped_column(String(16), default="reminder")
+    last_id: Mapped[str] = mapped_column(String(64), default="")
+    reminders: Mapped[int] = mapped_column(Integer, default=0)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
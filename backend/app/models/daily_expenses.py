@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import JSON, BigInteger, Date, DateTime, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DailyExpense(Base):
+    __tablename__ = "daily_expenses"
+    __table_args__ = (
+        Index("ix_daily_expenses_user_date", "user_id", "date", "id"),
+        Index("ix_daily_expenses_user_category_date", "user_id", "category_id", "date", "id"),
+        Index("uq_daily_expenses_user_source", "user_id", "source_type", "source_id", unique=True),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64))
+    description: Mapped[str] = mapped_column(String(500))
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    date: Mapped[datetime] = mapped_column(DateTime)
+    category_id: Mapped[str] = mapped_column(String(64))
+    payment_method: Mapped[str] = mapped_column(String(32))
+    notes: Mapped[str | None] = mapped_column(String, nullable=True)
+    source_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    source_type: Mapped[str | None] = mapped_column(String(32), nullable=True, default="manual")
+    # ``metadata`` is reserved on declarative classes, hence the attribute name.
+    metadata_: Mapped[Any | None] = mapped_column("metadata", JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class DailyExpenseRollup(Base):
+    """Per-user, per-month, per-category totals (in minor units) behind ``/daily-expenses/stats``."""
+
+    __tablename__ = "daily_expense_rollups"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    category_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    total: Mapped[int] = mapped_column(BigInteger, default=0)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class UserSettings(Base):
+    __tablename__ = "user_settings"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    monthly_salary: Mapped[Decimal | None] = mapped_column(Numeric(14, 2), nullable=True)
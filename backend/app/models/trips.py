@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import JSON, BigInteger, Date, DateTime, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Trip(Base):
+    __tablename__ = "trips"
+    __table_args__ = (Index("ix_trips_owner_type_created", "owner_id", "type", "created_at"),)
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    name: Mapped[str] = mapped_column(String(200))
+    owner_id: Mapped[str] = mapped_column(String(64), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    icon: Mapped[str | None] = mapped_column(String(64), default="plane")
+    custom_image: Mapped[str | None] = mapped_column(String, nullable=True)
+    share_token: Mapped[str | None] = mapped_column(String(64), unique=True, nullable=True)
+    share_permission: Mapped[str | None] = mapped_column(String(8), nullable=True)
+    type: Mapped[str | None] = mapped_column(String(16), default="trip")
+    currency: Mapped[str | None] = mapped_column(String(8), default="INR")
+    version: Mapped[int] = mapped_column(BigInteger, default=1)
+
+
+class Participant(Base):
+    __tablename__ = "participants"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    trip_id: Mapped[str] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"), index=True)
+    name: Mapped[str] = mapped_column(String(200))
+    user_id: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class Expense(Base):
+    __tablename__ = "expenses"
+    __table_args__ = (Index("ix_expenses_trip_date", "trip_id", "date", "id"),)
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    trip_id: Mapped[str] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"))
+    description: Mapped[str] = mapped_column(String(500))
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2))
+    date: Mapped[datetime] = mapped_column(DateTime)
+    category: Mapped[str] = mapped_column(String(64), default="Others")
+    paid_by: Mapped[str] = mapped_column(String(64))
+    split_among: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    is_payment: Mapped[bool | None] = mapped_column(nullable=True)
+    batch_id: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_logs"
+    __table_args__ = (
+        Index("ix_change_logs_trip_timestamp", "trip_id", "timestamp", "id"),
+        Index("ix_change_logs_trip_seq", "trip_id", "seq", unique=True),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    trip_id: Mapped[str] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"))
+    actor_name: Mapped[str] = mapped_column(String(200))
+    action: Mapped[str] = mapped_column(String(16))
+    item_type: Mapped[str] = mapped_column(String(16))
+    item_id: Mapped[str] = mapped_column(String(64))
+    description: Mapped[str] = mapped_column(String(500))
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    previous_data: Mapped[Any | None] = mapped_column(JSON, nullable=True)
+    current_data: Mapped[Any | None] = mapped_column(JSON, nullable=True)
+    reverted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    seq: Mapped[int] = mapped_column(BigInteger)
+
+
+class TripSnapshot(Base):
+    __tablename__ = "trip_snapshots"
+
+    trip_id: Mapped[str] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    taken_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    data: Mapped[dict[str, Any]] = mapped_column(JSON)
+
+
+class TripBalance(Base):
+    __tablename__ = "trip_balances"
+
+    trip_id: Mapped[str] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
+    participant_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    paid: Mapped[int] = mapped_column(BigInteger, default=0)
+    share: Mapped[int] = mapped_column(BigInteger, default=0)
+    received: Mapped[int] = mapped_column(BigInteger, default=0)
+    net: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class TripBalanceCheckpoint(Base):
+    __tablename__ = "trip_balance_checkpoints"
+
+    trip_id: Mapped[str] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    points: Mapped[list[Any]] = mapped_column(JSON)
+    closing: Mapped[dict[str, int]] = mapped_column(JSON)
+
+
+class OwnerTripShare(Base):
+    """The trip owner's share of a trip's expenses (minor units), summed over the participants linked to them.
+
+    ``linked`` counts those participants; with none the owner's share of the trip is unknown.
+    """
+
+    __tablename__ = "owner_trip_shares"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    trip_id: Mapped[str] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True, index=True)
+    share: Mapped[int] = mapped_column(BigInteger, default=0)
+    linked: Mapped[int] = mapped_column(Integer, default=0)
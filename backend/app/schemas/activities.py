@@ -0,0 +1,12 @@
+from typing import Literal
+
+from app.schemas.common import APIModel
+from app.schemas.trips import Trip
+
+ActivityType = Literal["dining", "movies", "play"]
+
+
+class ActivityEvents(APIModel):
+    dining: list[Trip]
+    movies: list[Trip]
+    play: list[Trip]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
 
@@ -19,6 +19,14 @@ class APIModel(BaseModel):
     }
 
 
+T = TypeVar("T")
+
+
+class Page(APIModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
 class ChartSlice(APIModel):
     label: str
     value: float
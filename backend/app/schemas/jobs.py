@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Literal
+
+from app.schemas.common import APIModel
+
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class Job(APIModel):
+    id: str
+    kind: str
+    status: JobStatus
+    progress: int
+    total: int | None = None
+    result: Any | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -1,4 +1,5 @@
 from app.schemas.common import APIModel
+from app.schemas.trips import Expense, Trip
 
 
 class UserStats(APIModel):
@@ -6,6 +7,10 @@ class UserStats(APIModel):
     trip_count: int
 
 
+class ProfileExpense(Expense):
+    trip_name: str
+
+
 class UserProfileData(APIModel):
-    trips: list[dict]
-    expenses: list[dict]
+    trips: list[Trip]
+    expenses: list[ProfileExpense]
@@ -29,6 +29,7 @@ class Participant(APIModel):
     id: str
     trip_id: str
     name: str
+    user_id: str | None = None  # set when the participant is the trip's owner
 
 
 class Expense(APIModel):
@@ -93,16 +94,28 @@ class AnalyticsData(APIModel):
     individual_share_stats: list[IndividualShareStat]
 
 
+TripViewSection = Literal[
+    "participants",
+    "expenses",
+    "logs",
+    "settlementData",
+    "dailyBalances",
+    "groupedExpenses",
+    "analyticsData",
+    "userShare",
+]
+
+
 class TripDetailsView(APIModel):
     trip: Trip
-    participants: list[Participant]
-    expenses: list[Expense]
-    logs: list[ChangeLog]
-    settlement_data: SettlementSummary
-    daily_balances: list[DailyBalancePoint]
-    grouped_expenses: GroupedExpenses
-    analytics_data: AnalyticsData
-    user_share: float
+    participants: list[Participant] | None = None
+    expenses: list[Expense] | None = None
+    logs: list[ChangeLog] | None = None
+    settlement_data: SettlementSummary | None = None
+    daily_balances: list[DailyBalancePoint] | None = None
+    grouped_expenses: GroupedExpenses | None = None
+    analytics_data: AnalyticsData | None = None
+    user_share: float | None = None
     share_token: str | None = None
     share_permission: SharePermission | None = None
 
@@ -124,6 +137,17 @@ class UpdateTripRequest(APIModel):
 
 class CreateParticipantRequest(APIModel):
     name: str
+    is_me: bool = False
+
+
+class ExpenseFields(APIModel):
+    description: str | None = None
+    amount: float | None = None
+    date: datetime | None = None
+    category: str | None = None
+    paid_by: str | None = None
+    split_among: list[str] | None = None
+    is_payment: bool | None = None
 
 
 class CreateExpenseRequest(APIModel):
@@ -136,6 +160,19 @@ class UpdateExpenseRequest(APIModel):
     actor: dict[str, str] | None = None
 
 
+class BatchRowError(APIModel):
+    row: int
+    error: str
+
+
+class BatchImportResponse(APIModel):
+    batch_id: str
+    inserted: int
+    failed: int
+    errors: list[BatchRowError]
+    errors_truncated: bool = False
+
+
 class CreateShareLinkRequest(APIModel):
     permission: SharePermission
 
@@ -0,0 +1,47 @@
+"""Cached activity events (dining, movies and play trips) per user.
+
+All three lists come from one query on ``ix_trips_owner_type_created`` and are kept in
+an in-process LRU keyed by user. An entry is dropped when any of the user's trips
+changes version, or one is created or deleted (see ``trips.mark_changed``), and
+otherwise expires after a short TTL, which bounds staleness across worker processes.
+"""
+
+from __future__ import annotations
+
+from typing import get_args
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.serialization import validate
+from app.models import trips as models
+from app.schemas.activities import ActivityEvents, ActivityType
+from app.schemas.trips import Trip
+
+ACTIVITY_TYPES: tuple[str, ...] = get_args(ActivityType)
+
+_cache: TTLCache[str, ActivityEvents] = TTLCache(settings.activity_cache_size, settings.activity_cache_ttl_seconds)
+
+
+async def events(db: AsyncSession, user_id: str) -> ActivityEvents:
+    """The user's activity trips by type, newest first."""
+    cached = _cache.get(user_id)
+    if cached is not None:
+        return cached
+    stmt = (
+        select(models.Trip)
+        .where(models.Trip.owner_id == user_id, models.Trip.type.in_(ACTIVITY_TYPES))
+        .order_by(models.Trip.type, models.Trip.created_at.desc(), models.Trip.id)
+    )
+    grouped: dict[str, list[Trip]] = {trip_type: [] for trip_type in ACTIVITY_TYPES}
+    for trip in await db.scalars(stmt):
+        grouped[trip.type].append(validate(Trip, trip))
+    result = ActivityEvents(**grouped)
+    _cache.set(user_id, result)
+    return result
+
+
+def invalidate_user(user_id: str) -> None:
+    _cache.pop(user_id)
@@ -0,0 +1,166 @@
+"""Trip analytics computed in one columnar pass.
+
+Expenses are loaded once into NumPy arrays and every chart in ``AnalyticsData`` is a
+vectorized group-by (``np.bincount``) over those columns. Splits are stored as flat
+``(expense, participant)`` pairs rather than a bitmask so trips with more than 64
+participants need no special casing.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from app.schemas.common import ChartBar, ChartSlice
+from app.schemas.trips import AnalyticsData, CategoryStatsItem, IndividualShareStat, Participant, TotalPayerStat
+from app.services.settlement import ExpenseLike, ParticipantLike, from_minor, to_minor
+
+PALETTE = [
+    "#3B82F6",
+    "#F97316",
+    "#10B981",
+    "#8B5CF6",
+    "#EC4899",
+    "#F59E0B",
+    "#14B8A6",
+    "#EF4444",
+    "#6366F1",
+    "#84CC16",
+]
+
+
+@dataclass(slots=True)
+class ExpenseColumns:
+    amount: np.ndarray
+    payer: np.ndarray
+    category: np.ndarray
+    day: np.ndarray
+    is_payment: np.ndarray
+    split_expense: np.ndarray
+    split_participant: np.ndarray
+    categories: list[str]
+
+
+def load_columns(expenses: Iterable[ExpenseLike], participant_index: dict[str, int]) -> ExpenseColumns:
+    """Load expenses into columns; unknown participant ids map to ``len(participant_index)``."""
+    unknown = len(participant_index)
+    category_codes: dict[str, int] = {}
+    amount, payer, category, day, is_payment = [], [], [], [], []
+    split_expense, split_participant = [], []
+
+    for i, e in enumerate(expenses):
+        amount.append(to_minor(e.amount))
+        payer.append(participant_index.get(e.paid_by, unknown))
+        category.append(category_codes.setdefault(e.category, len(category_codes)))
+        day.append(e.date.toordinal())
+        is_payment.append(bool(e.is_payment))
+        targets = list(dict.fromkeys(e.split_among or [])) or [e.paid_by]
+        split_expense.extend([i] * len(targets))
+        split_participant.extend(participant_index.get(pid, unknown) for pid in targets)
+
+    return ExpenseColumns(
+        amount=np.asarray(amount, dtype=np.int64),
+        payer=np.asarray(payer, dtype=np.int64),
+        category=np.asarray(category, dtype=np.int64),
+        day=np.asarray(day, dtype=np.int64),
+        is_payment=np.asarray(is_payment, dtype=bool),
+        split_expense=np.asarray(split_expense, dtype=np.int64),
+        split_participant=np.asarray(split_participant, dtype=np.int64),
+        categories=list(category_codes),
+    )
+
+
+def split_shares(cols: ExpenseColumns) -> np.ndarray:
+    """Per split-row share in paise, matching ``settlement.split_minor`` exactly."""
+    n_expenses = len(cols.amount)
+    ways = np.bincount(cols.split_expense, minlength=n_expenses)
+    offsets = np.concatenate(([0], np.cumsum(ways)[:-1])) if n_expenses else np.zeros(0, dtype=np.int64)
+    position = np.arange(len(cols.split_expense)) - offsets[cols.split_expense]
+    safe_ways = np.maximum(ways, 1)
+    base = cols.amount // safe_ways
+    extra = cols.amount % safe_ways
+    return base[cols.split_expense] + (position < extra[cols.split_expense])
+
+
+def _grouped(keys: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    return np.rint(np.bincount(keys, weights=weights, minlength=size)).astype(np.int64)
+
+
+def _ranked(names: list[str], values: np.ndarray) -> list[tuple[str, float]]:
+    order = np.argsort(-values, kind="stable")
+    return [(names[k], from_minor(int(values[k]))) for k in order if values[k] > 0]
+
+
+def compute(participants: Sequence[ParticipantLike], expenses: Iterable[ExpenseLike]) -> AnalyticsData:
+    index = {p.id: i for i, p in enumerate(participants)}
+    cols = load_columns(expenses, index)
+    n_people = len(participants) + 1
+    n_cats = max(len(cols.categories), 1)
+
+    spend = ~cols.is_payment
+    amount = cols.amount[spend]
+    category = cols.category[spend]
+
+    split_spend = spend[cols.split_expense]
+    shares = split_shares(cols)[split_spend]
+    share_who = cols.split_participant[split_spend]
+    share_cat = cols.category[cols.split_expense][split_spend]
+
+    paid_by_cat = _grouped(cols.payer[spend] * n_cats + category, amount, n_people * n_cats).reshape(n_people, n_cats)
+    share_by_cat = _grouped(share_who * n_cats + share_cat, shares, n_people * n_cats).reshape(n_people, n_cats)
+    category_totals = _grouped(category, amount, n_cats)
+
+    days, day_inverse = np.unique(cols.day[spend], return_inverse=True)
+    day_totals = _grouped(day_inverse, amount, len(days))
+
+    names = [p.name for p in participants]
+    paid_totals = paid_by_cat.sum(axis=1)
+    share_totals = share_by_cat.sum(axis=1)
+
+    participant_stats = [
+        ChartSlice(label=names[i], value=from_minor(int(share_totals[i])), color=PALETTE[i % len(PALETTE)])
+        for i in range(len(participants))
+        if share_totals[i] > 0
+    ]
+    daily_stats = [
+        ChartBar(label=date.fromordinal(int(d)).isoformat(), value=from_minor(int(v)))
+        for d, v in zip(days, day_totals)
+    ]
+    category_stats = [
+        CategoryStatsItem(
+            category=cols.categories[c],
+            total=from_minor(int(category_totals[c])),
+            involved=dict(_ranked(names, share_by_cat[: len(participants), c])),
+        )
+        for c in np.argsort(-category_totals, kind="stable")
+        if c < len(cols.categories) and category_totals[c] > 0
+    ]
+    total_payer_stats = [
+        TotalPayerStat(
+            id=participants[i].id,
+            name=names[i],
+            amount=from_minor(int(paid_totals[i])),
+            categories=_ranked(cols.categories, paid_by_cat[i, : len(cols.categories)]),
+        )
+        for i in np.argsort(-paid_totals[: len(participants)], kind="stable")
+    ]
+    individual_share_stats = [
+        IndividualShareStat(
+            participant=Participant.model_validate(participants[i]),
+            total=from_minor(int(share_totals[i])),
+            categories=_ranked(cols.categories, share_by_cat[i, : len(cols.categories)]),
+        )
+        for i in np.argsort(-share_totals[: len(participants)], kind="stable")
+    ]
+
+    return AnalyticsData(
+        participant_stats=participant_stats,
+        daily_stats=daily_stats,
+        category_stats=category_stats,
+        total_trip_cost=from_minor(int(amount.sum())),
+        total_payer_stats=total_payer_stats,
+        individual_share_stats=individual_share_stats,
+    )
@@ -0,0 +1,229 @@
+"""Recurring bills and subscriptions.
+
+Each item stores its next due date (``next_due``), so the overview's upcoming list is
+an index range scan rather than date math over every item on every request. Due
+dates that have passed are rolled forward by the daily ``rollover`` (all users, in
+batches) and, for anything it has not reached yet, when the owner next reads. The
+monthly sums of active items are kept per user in ``RecurringTotals``.
+"""
+
+from __future__ import annotations
+
+import calendar
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import insert_for, new_id
+from app.models import bills as models
+from app.schemas.bills import (
+    CreateRecurringItemRequest,
+    MonthlyTotals,
+    RecurringItem,
+    RecurringOverview,
+    UpcomingItem,
+    UpdateRecurringItemRequest,
+)
+from app.services.settlement import from_minor, to_minor
+
+UPCOMING_DAYS = 31
+ROLLOVER_BATCH_SIZE = 1000
+
+
+def _clamped(year: int, month: int, due_day: int) -> date:
+    return date(year, month, min(due_day, calendar.monthrange(year, month)[1]))
+
+
+def next_due(due_day: int, on_or_after: date) -> date:
+    """First due date on or after ``on_or_after``; a day past the month's end means its last day (31 -> Feb 28)."""
+    due = _clamped(on_or_after.year, on_or_after.month, due_day)
+    if due >= on_or_after:
+        return due
+    year, month = (on_or_after.year + 1, 1) if on_or_after.month == 12 else (on_or_after.year, on_or_after.month + 1)
+    return _clamped(year, month, due_day)
+
+
+def _schedule(item: models.RecurringItem, due: date) -> None:
+    item.next_due = due
+    item.next_reminder = due - timedelta(days=item.reminder_days_before)
+
+
+def _validate(due_day: int | None, reminder_days_before: int | None, amount: float | None) -> None:
+    if due_day is not None and not 1 <= due_day <= 31:
+        raise HTTPException(status_code=400, detail="Due day must be between 1 and 31")
+    if reminder_days_before is not None and not 0 <= reminder_days_before <= 31:
+        raise HTTPException(status_code=400, detail="Reminder days must be between 0 and 31")
+    if amount is not None and amount < 0:
+        raise HTTPException(status_code=400, detail="Amount must not be negative")
+
+
+def _contribution(item: models.RecurringItem, sign: int) -> tuple[int, int]:
+    if not item.is_active:
+        return 0, 0
+    amount = sign * to_minor(item.amount)
+    return (amount, 0) if item.kind == "bill" else (0, amount)
+
+
+async def _adjust_totals(db: AsyncSession, user_id: str, *deltas: tuple[int, int]) -> None:
+    """Add to the user's monthly totals in SQL, so concurrent item writes don't lose updates."""
+    bills, subs = sum(d[0] for d in deltas), sum(d[1] for d in deltas)
+    if not bills and not subs:
+        return
+    totals = models.RecurringTotals
+    stmt = insert_for(db, totals).values(user_id=user_id, bills=bills, subs=subs)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[totals.user_id],
+            set_={"bills": totals.bills + stmt.excluded.bills, "subs": totals.subs + stmt.excluded.subs},
+        )
+    )
+
+
+def to_schema(item: models.RecurringItem) -> RecurringItem:
+    return RecurringItem.model_validate(item)
+
+
+async def list_items(db: AsyncSession, user_id: str) -> list[models.RecurringItem]:
+    stmt = select(models.RecurringItem).where(models.RecurringItem.user_id == user_id).order_by(models.RecurringItem.created_at, models.RecurringItem.id)
+    return list(await db.scalars(stmt))
+
+
+async def get_item(db: AsyncSession, user_id: str, item_id: str) -> models.RecurringItem:
+    item = await db.get(models.RecurringItem, item_id)
+    if item is None or item.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
+
+
+async def create_item(db: AsyncSession, user_id: str, payload: CreateRecurringItemRequest, today: date | None = None) -> models.RecurringItem:
+    _validate(payload.due_day, payload.reminder_days_before, payload.amount)
+    today = today or datetime.utcnow().date()
+    item = models.RecurringItem(
+        id=new_id("ri"),
+        user_id=user_id,
+        name=payload.name,
+        kind=payload.kind,
+        category=payload.category,
+        amount=Decimal(str(payload.amount)),
+        due_day=payload.due_day,
+        reminder_days_before=payload.reminder_days_before,
+        auto_pay_enabled=payload.auto_pay_enabled,
+        is_active=payload.is_active,
+        notes=payload.notes,
+        created_at=datetime.utcnow(),
+    )
+    _schedule(item, next_due(payload.due_day, today))
+    db.add(item)
+    await _adjust_totals(db, user_id, _contribution(item, 1))
+    return item
+
+
+async def update_item(db: AsyncSession, item: models.RecurringItem, payload: UpdateRecurringItemRequest, today: date | None = None) -> None:
+    data = payload.model_dump(exclude_unset=True)
+    _validate(data.get("due_day"), data.get("reminder_days_before"), data.get("amount"))
+    before = _contribution(item, -1)
+    if data.get("amount") is not None:
+        data["amount"] = Decimal(str(data["amount"]))
+    for key, value in data.items():
+        if value is not None or key == "notes":
+            setattr(item, key, value)
+    if data.get("due_day") is not None:
+        _schedule(item, next_due(item.due_day, today or datetime.utcnow().date()))
+    elif data.get("reminder_days_before") is not None:
+        _schedule(item, item.next_due)
+    await _adjust_totals(db, item.user_id, before, _contribution(item, 1))
+
+
+async def delete_item(db: AsyncSession, item: models.RecurringItem) -> None:
+    await _adjust_totals(db, item.user_id, _contribution(item, -1))
+    await db.delete(item)
+
+
+async def rollover(db: AsyncSession, today: date, limit: int = ROLLOVER_BATCH_SIZE) -> int:
+    """Roll up to ``limit`` passed due dates forward to their next occurrence; returns how many.
+
+    Callers commit and repeat until it returns 0.
+    """
+    stmt = (
+        select(models.RecurringItem.id, models.RecurringItem.due_day, models.RecurringItem.reminder_days_before)
+        .where(models.RecurringItem.next_due < today)
+        .order_by(models.RecurringItem.next_due, models.RecurringItem.id)
+        .limit(limit)
+    )
+    values = []
+    for item_id, due_day, reminder_days_before in (await db.execute(stmt)).all():
+        due = next_due(due_day, today)
+        values.append({"id": item_id, "next_due": due, "next_reminder": due - timedelta(days=reminder_days_before)})
+    if values:
+        await db.execute(update(models.RecurringItem), values)
+    return len(values)
+
+
+def _upcoming(item: models.RecurringItem, due: date, today: date) -> UpcomingItem:
+    reminder = due - timedelta(days=item.reminder_days_before)
+    return UpcomingItem(
+        item=to_schema(item),
+        due_date=due.isoformat(),
+        days_until_due=(due - today).days,
+        reminder_date=reminder.isoformat(),
+        days_until_reminder=(reminder - today).days,
+    )
+
+
+async def overview(db: AsyncSession, user_id: str, today: date | None = None, persist: bool = True) -> RecurringOverview:
+    """Items, monthly totals and active items due in the next ``UPCOMING_DAYS``, soonest first.
+
+    Items the daily rollover has not reached yet are rolled here, and written back
+    when ``persist`` (the caller commits).
+    """
+    today = today or datetime.utcnow().date()
+    items = await list_items(db, user_id)
+    stale = {item.id: next_due(item.due_day, today) for item in items if item.next_due < today}
+    if stale and persist:
+        for item in items:
+            if item.id in stale:
+                _schedule(item, stale[item.id])
+        await db.flush()
+        stale = {}
+
+    window = today + timedelta(days=UPCOMING_DAYS)
+    scan = (
+        select(models.RecurringItem)
+        .where(
+            models.RecurringItem.user_id == user_id,
+            models.RecurringItem.is_active.is_(True),
+            models.RecurringItem.next_due >= today,
+            models.RecurringItem.next_due <= window,
+        )
+        .order_by(models.RecurringItem.next_due, models.RecurringItem.id)
+    )
+    due_items = [(item, item.next_due) for item in await db.scalars(scan)]
+    by_id = {item.id: item for item in items}
+    due_items += [(by_id[item_id], due) for item_id, due in stale.items() if by_id[item_id].is_active and due <= window]
+    due_items.sort(key=lambda pair: (pair[1], pair[0].id))
+
+    totals = await db.get(models.RecurringTotals, user_id, populate_existing=True)
+    bills, subs = (totals.bills, totals.subs) if totals is not None else (0, 0)
+    return RecurringOverview(
+        items=[to_schema(item) for item in items],
+        monthly_totals=MonthlyTotals(bills=from_minor(bills), subs=from_minor(subs), total=from_minor(bills + subs)),
+        upcoming=[_upcoming(item, due, today) for item, due in due_items],
+    )
+
+
+async def rebuild_totals(db: AsyncSession, user_id: str) -> bool:
+    """Recompute a user's monthly totals from their items; returns whether they were wrong."""
+    bills = subs = 0
+    for item in await list_items(db, user_id):
+        b, s = _contribution(item, 1)
+        bills, subs = bills + b, subs + s
+    totals = await db.get(models.RecurringTotals, user_id, populate_existing=True, with_for_update=True)
+    if totals is None:
+        totals = models.RecurringTotals(user_id=user_id, bills=0, subs=0)
+        db.add(totals)
+    wrong = (totals.bills, totals.subs) != (bills, subs)
+    totals.bills, totals.subs = bills, subs
+    return wrong
@@ -0,0 +1,130 @@
+"""Running per-participant balance series for ``TripDetailsView.daily_balances``.
+
+The series is a cumulative sum over per-day net deltas. Each calendar month that has
+activity is stored as a checkpoint (its daily points plus the closing balances), and
+any expense write invalidates the checkpoints from its month onwards, so an edit to a
+recent expense only recomputes the tail after the nearest surviving checkpoint.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import insert_for
+from app.db.session import is_replica
+from app.models import trips as models
+from app.schemas.trips import DailyBalancePoint
+from app.services.settlement import expense_contributions, from_minor
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
+
+
+async def invalidate(db: AsyncSession, trip_id: str, when: datetime | date) -> None:
+    day = when.date() if isinstance(when, datetime) else when
+    # Lock the trip row before dropping checkpoints, so a concurrent read (see ``series``)
+    # can't store months it computed before this write once the write commits.
+    await db.execute(select(models.Trip.id).where(models.Trip.id == trip_id).with_for_update())
+    await db.execute(
+        delete(models.TripBalanceCheckpoint).where(
+            models.TripBalanceCheckpoint.trip_id == trip_id,
+            models.TripBalanceCheckpoint.month >= _month_start(day),
+        )
+    )
+
+
+async def _tail(
+    db: AsyncSession,
+    trip_id: str,
+    since: date | None,
+    opening: dict[str, int],
+    expenses: list[models.Expense] | None = None,
+) -> list[models.TripBalanceCheckpoint]:
+    start = datetime.combine(since, datetime.min.time()) if since is not None else None
+    if expenses is None:
+        stmt = select(models.Expense).where(models.Expense.trip_id == trip_id).order_by(models.Expense.date, models.Expense.id)
+        if start is not None:
+            stmt = stmt.where(models.Expense.date >= start)
+        expenses = list(await db.scalars(stmt))
+    elif start is not None:
+        expenses = [e for e in expenses if e.date >= start]
+
+    day_index: dict[date, int] = {}
+    people: dict[str, int] = {pid: i for i, pid in enumerate(opening)}
+    rows, cols, deltas = [], [], []
+    for expense in expenses:
+        d = day_index.setdefault(expense.date.date(), len(day_index))
+        for pid, paid, share, received in expense_contributions(expense):
+            rows.append(d)
+            cols.append(people.setdefault(pid, len(people)))
+            deltas.append(paid - share - received)
+    if not day_index:
+        return []
+
+    matrix = np.zeros((len(day_index), len(people)), dtype=np.int64)
+    np.add.at(matrix, (np.asarray(rows), np.asarray(cols)), np.asarray(deltas, dtype=np.int64))
+    matrix = np.cumsum(matrix, axis=0)
+    matrix += np.asarray([opening.get(pid, 0) for pid in people], dtype=np.int64)
+
+    ids = list(people)
+    checkpoints: list[models.TripBalanceCheckpoint] = []
+    for day, i in day_index.items():
+        month = _month_start(day)
+        if not checkpoints or checkpoints[-1].month != month:
+            checkpoints.append(models.TripBalanceCheckpoint(trip_id=trip_id, month=month, points=[], closing={}))
+        balances = {pid: int(v) for pid, v in zip(ids, matrix[i])}
+        checkpoints[-1].points.append([day.isoformat(), balances])
+        checkpoints[-1].closing = balances
+    return checkpoints
+
+
+async def _still_current(db: AsyncSession, trip_id: str, version: int) -> bool:
+    """Whether the trip is still at ``version``, waiting out any writer holding its row."""
+    current = await db.scalar(select(models.Trip.version).where(models.Trip.id == trip_id).with_for_update(read=True))
+    return current == version
+
+
+async def series(
+    db: AsyncSession,
+    trip_id: str,
+    expenses: list[models.Expense] | None = None,
+    version: int | None = None,
+) -> list[DailyBalancePoint]:
+    """``expenses``, if the caller already loaded them, must be all of the trip's, ordered by (date, id).
+
+    Recomputed months are stored as checkpoints only when ``version``, the trip version
+    read before the expenses, is still current; without it nothing is stored.
+    """
+    stored = list(
+        await db.scalars(
+            select(models.TripBalanceCheckpoint)
+            .where(models.TripBalanceCheckpoint.trip_id == trip_id)
+            .order_by(models.TripBalanceCheckpoint.month)
+        )
+    )
+    since = _next_month(stored[-1].month) if stored else None
+    opening = dict(stored[-1].closing) if stored else {}
+
+    fresh = await _tail(db, trip_id, since, opening, expenses)
+    if fresh and version is not None and not is_replica(db) and await _still_current(db, trip_id, version):
+        # A concurrent cold read may have stored the same months first; theirs are identical.
+        await db.execute(
+            insert_for(db, models.TripBalanceCheckpoint)
+            .values([{"trip_id": c.trip_id, "month": c.month, "points": c.points, "closing": c.closing} for c in fresh])
+            .on_conflict_do_nothing()
+        )
+
+    return [
+        DailyBalancePoint(date=day, balances={pid: from_minor(v) for pid, v in balances.items()})
+        for checkpoint in stored + fresh
+        for day, balances in checkpoint.points
+    ]
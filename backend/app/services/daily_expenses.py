@@ -0,0 +1,411 @@
+"""Personal daily expenses and the monthly rollups behind their stats.
+
+Every write adjusts ``DailyExpenseRollup`` rows (user, month, category) in the same
+transaction, so ``stats`` reads a handful of pre-aggregated rows instead of the
+user's whole history. ``rebuild_rollups`` recomputes them from the expenses.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import Select, delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import insert_for, new_id
+from app.models import daily_expenses as models
+from app.models import trips as trip_models
+from app.schemas.common import Page
+from app.schemas.daily_expenses import (
+    CreateDailyExpenseRequest,
+    DailyCategory,
+    DailyExpense,
+    DailyStats,
+    UpdateDailyExpenseRequest,
+)
+from app.core.serialization import dump_json
+from app.services import pagination
+from app.services.settlement import MINOR_UNITS, from_minor, to_minor
+
+DEFAULT_CATEGORIES = [
+    ("food", "Food & Dining", "utensils", "#f97316"),
+    ("transport", "Transport", "car", "#3b82f6"),
+    ("shopping", "Shopping", "shopping-bag", "#ec4899"),
+    ("bills", "Bills & Utilities", "receipt", "#eab308"),
+    ("entertainment", "Entertainment", "film", "#8b5cf6"),
+    ("health", "Health", "heart-pulse", "#ef4444"),
+    ("travel", "Travel", "plane", "#06b6d4"),
+    ("education", "Education", "graduation-cap", "#14b8a6"),
+    ("investments", "Investments", "trending-up", "#22c55e"),
+    ("others", "Others", "more-horizontal", "#6b7280"),
+]
+
+# Sync sources map to the trip type they import from and the category they land in.
+SYNC_SOURCES = {
+    "trip": ("trip", "travel"),
+    "dining": ("dining", "food"),
+    "play": ("play", "entertainment"),
+    "entertainment": ("movies", "entertainment"),
+}
+
+CAUTION_PERCENT = 75.0
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_COLUMNS = ["id", "date", "description", "amount", "categoryId", "paymentMethod", "notes", "sourceType", "sourceId"]
+
+RollupKey = tuple[date, str]
+
+
+def month_start(when: datetime | date) -> date:
+    return date(when.year, when.month, 1)
+
+
+def categories(user_id: str) -> list[DailyCategory]:
+    return [
+        DailyCategory(id=cid, user_id=user_id, name=name, icon=icon, color=color, is_custom=False)
+        for cid, name, icon, color in DEFAULT_CATEGORIES
+    ]
+
+
+def to_schema(expense: models.DailyExpense) -> DailyExpense:
+    return DailyExpense(
+        id=expense.id,
+        user_id=expense.user_id,
+        description=expense.description,
+        amount=float(expense.amount),
+        date=expense.date,
+        category_id=expense.category_id,
+        payment_method=expense.payment_method,
+        notes=expense.notes,
+        source_id=expense.source_id,
+        source_type=expense.source_type,
+        metadata=expense.metadata_,
+    )
+
+
+def _contributions(expenses: Iterable[models.DailyExpense], sign: int) -> dict[RollupKey, tuple[int, int]]:
+    deltas: dict[RollupKey, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    for e in expenses:
+        key = (month_start(e.date), e.category_id)
+        total, count = deltas[key]
+        deltas[key] = (total + sign * to_minor(e.amount), count + sign)
+    return deltas
+
+
+async def adjust_rollups(db: AsyncSession, user_id: str, deltas: dict[RollupKey, tuple[int, int]]) -> None:
+    """Apply ``(total, count)`` deltas to the user's rollup rows, creating or dropping rows as needed.
+
+    The deltas are added in SQL by one upsert, and emptied rows are deleted by a
+    ``count <= 0`` condition, so concurrent writes by the same user compose.
+    """
+    deltas = {k: v for k, v in deltas.items() if v != (0, 0)}
+    if not deltas:
+        return
+    rollup = models.DailyExpenseRollup
+    stmt = insert_for(db, rollup).values(
+        [
+            {"user_id": user_id, "month": month, "category_id": category_id, "total": total, "count": count}
+            for (month, category_id), (total, count) in sorted(deltas.items())
+        ]
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[rollup.user_id, rollup.month, rollup.category_id],
+            set_={"total": rollup.total + stmt.excluded.total, "count": rollup.count + stmt.excluded.count},
+        )
+    )
+    if any(count < 0 for _, count in deltas.values()):
+        await db.execute(
+            delete(rollup).where(
+                rollup.user_id == user_id,
+                tuple_(rollup.month, rollup.category_id).in_(list(deltas)),
+                rollup.count <= 0,
+            )
+        )
+
+
+def _merge(*parts: dict[RollupKey, tuple[int, int]]) -> dict[RollupKey, tuple[int, int]]:
+    merged: dict[RollupKey, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    for part in parts:
+        for key, (total, count) in part.items():
+            t, c = merged[key]
+            merged[key] = (t + total, c + count)
+    return merged
+
+
+@dataclass(frozen=True, slots=True)
+class ExpenseFilter:
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    category_ids: tuple[str, ...] = ()
+    payment_methods: tuple[str, ...] = ()
+    source_types: tuple[str, ...] = ()
+    search: str | None = None
+
+
+def _filtered(user_id: str, filters: ExpenseFilter) -> Select:
+    e = models.DailyExpense
+    stmt = select(e).where(e.user_id == user_id)
+    if filters.date_from is not None:
+        stmt = stmt.where(e.date >= filters.date_from)
+    if filters.date_to is not None:
+        stmt = stmt.where(e.date < filters.date_to)
+    if filters.category_ids:
+        stmt = stmt.where(e.category_id.in_(filters.category_ids))
+    if filters.payment_methods:
+        stmt = stmt.where(e.payment_method.in_(filters.payment_methods))
+    if filters.source_types:
+        stmt = stmt.where(e.source_type.in_(filters.source_types))
+    if filters.search:
+        stmt = stmt.where(func.lower(e.description).contains(filters.search.lower(), autoescape=True))
+    return stmt
+
+
+async def page_expenses(db: AsyncSession, user_id: str, filters: ExpenseFilter, limit: int, cursor: str | None) -> Page[DailyExpense]:
+    columns = (models.DailyExpense.date, models.DailyExpense.id)
+    stmt = pagination.keyset(_filtered(user_id, filters), columns, cursor)
+    rows = list(await db.scalars(stmt.limit(limit + 1)))
+    items = rows[:limit]
+    next_cursor = pagination.encode_cursor((items[-1].date, items[-1].id)) if len(rows) > limit else None
+    return Page[DailyExpense](items=[to_schema(e) for e in items], next_cursor=next_cursor)
+
+
+async def export_expenses(db: AsyncSession, user_id: str, filters: ExpenseFilter, fmt: str) -> AsyncIterator[bytes]:
+    """Yield the matching expenses as NDJSON or CSV, newest first, one batch of rows at a time.
+
+    Rows come from a server-side cursor (``yield_per``), so memory is bounded by
+    ``EXPORT_BATCH_SIZE`` rather than the user's history.
+    """
+    stmt = _filtered(user_id, filters).order_by(models.DailyExpense.date.desc(), models.DailyExpense.id.desc())
+    result = await db.stream_scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        async for batch in result.partitions():
+            for e in batch:
+                writer.writerow(
+                    [e.id, e.date.isoformat(), e.description, f"{e.amount:.2f}", e.category_id, e.payment_method, e.notes or "", e.source_type or "", e.source_id or ""]
+                )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+    else:
+        async for batch in result.partitions():
+            yield b"".join(dump_json(to_schema(e)) + b"\n" for e in batch)
+
+
+async def get_expense(db: AsyncSession, user_id: str, expense_id: str) -> models.DailyExpense:
+    expense = await db.get(models.DailyExpense, expense_id)
+    if expense is None or expense.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Expense not found")
+    return expense
+
+
+async def create_expense(db: AsyncSession, user_id: str, payload: CreateDailyExpenseRequest) -> models.DailyExpense:
+    expense = models.DailyExpense(
+        id=new_id("de"),
+        user_id=user_id,
+        description=payload.description,
+        amount=Decimal(str(payload.amount)),
+        date=payload.date,
+        category_id=payload.category_id,
+        payment_method=payload.payment_method,
+        notes=payload.notes,
+        source_type="manual",
+        created_at=datetime.utcnow(),
+    )
+    db.add(expense)
+    await adjust_rollups(db, user_id, _contributions([expense], 1))
+    return expense
+
+
+async def update_expense(db: AsyncSession, expense: models.DailyExpense, payload: UpdateDailyExpenseRequest) -> None:
+    before = _contributions([expense], -1)
+    data = payload.model_dump(exclude_unset=True)
+    if data.get("amount") is not None:
+        data["amount"] = Decimal(str(data["amount"]))
+    for key, value in data.items():
+        if value is not None or key == "notes":
+            setattr(expense, key, value)
+    await adjust_rollups(db, expense.user_id, _merge(before, _contributions([expense], 1)))
+
+
+async def delete_expense(db: AsyncSession, expense: models.DailyExpense) -> None:
+    await adjust_rollups(db, expense.user_id, _contributions([expense], -1))
+    await db.delete(expense)
+
+
+async def _trip_shares(db: AsyncSession, user_id: str, trip_types: list[str]) -> list[tuple]:
+    """``(id, type, name, created_at, currency, share)`` for every owned trip of ``trip_types``.
+
+    The user's share (minor units) is read from the per-trip owner shares the ledger
+    maintains, for all trips in one query. Trips where no participant is marked as the
+    user are skipped, since their share is unknown.
+    """
+    trip, owner_share = trip_models.Trip, trip_models.OwnerTripShare
+    trip_type = func.coalesce(trip.type, "trip")
+    stmt = (
+        select(trip.id, trip_type, trip.name, trip.created_at, trip.currency, owner_share.share)
+        .join(owner_share, owner_share.trip_id == trip.id)
+        .where(owner_share.user_id == user_id, owner_share.linked > 0, trip_type.in_(trip_types))
+    )
+    return [tuple(row) for row in (await db.execute(stmt)).all()]
+
+
+async def _delete_synced(db: AsyncSession, user_id: str, sources: list[str]) -> int:
+    stmt = select(models.DailyExpense).where(models.DailyExpense.user_id == user_id, models.DailyExpense.source_type.in_(sources))
+    synced = list(await db.scalars(stmt))
+    if synced:
+        await adjust_rollups(db, user_id, _contributions(synced, -1))
+        await db.execute(delete(models.DailyExpense).where(models.DailyExpense.id.in_([e.id for e in synced])))
+    return len(synced)
+
+
+async def sync(db: AsyncSession, user_id: str, sources: list[str]) -> int:
+    """Mirror the user's share of each owned trip of the selected types as one daily expense per trip.
+
+    Existing synced rows (unique on user, source type and source id) are diffed against
+    the ledger: only new, changed and vanished trips are written, so a repeat sync with
+    nothing changed issues no writes.
+    """
+    sources = [s for s in dict.fromkeys(sources) if s in SYNC_SOURCES]
+    if not sources:
+        return 0
+    sources_by_type = defaultdict(list)
+    for source in sources:
+        sources_by_type[SYNC_SOURCES[source][0]].append(source)
+
+    wanted: dict[tuple[str, str], dict] = {}
+    for trip_id, trip_type, name, created_at, currency, share in await _trip_shares(db, user_id, list(sources_by_type)):
+        if not share or share <= 0:
+            continue
+        for source in sources_by_type[trip_type]:
+            wanted[(source, trip_id)] = {
+                "description": name,
+                "amount": Decimal(int(share)) / MINOR_UNITS,
+                "date": created_at,
+                "category_id": SYNC_SOURCES[source][1],
+                "metadata_": {"currency": currency},
+            }
+
+    stmt = select(models.DailyExpense).where(models.DailyExpense.user_id == user_id, models.DailyExpense.source_type.in_(sources))
+    existing = {(e.source_type, e.source_id): e for e in await db.scalars(stmt)}
+
+    stale = [e for key, e in existing.items() if key not in wanted]
+    changed = [
+        (e, wanted[key])
+        for key, e in existing.items()
+        if key in wanted and any(getattr(e, attr) != value for attr, value in wanted[key].items())
+    ]
+    added = [
+        models.DailyExpense(
+            id=new_id("de"),
+            user_id=user_id,
+            payment_method="Other",
+            source_id=trip_id,
+            source_type=source,
+            created_at=datetime.utcnow(),
+            **values,
+        )
+        for (source, trip_id), values in wanted.items()
+        if (source, trip_id) not in existing
+    ]
+
+    deltas = [_contributions(stale, -1), _contributions([e for e, _ in changed], -1)]
+    for expense, values in changed:
+        for attr, value in values.items():
+            setattr(expense, attr, value)
+    deltas += [_contributions([e for e, _ in changed], 1), _contributions(added, 1)]
+
+    if stale:
+        await db.execute(delete(models.DailyExpense).where(models.DailyExpense.id.in_([e.id for e in stale])))
+    db.add_all(added)
+    await adjust_rollups(db, user_id, _merge(*deltas))
+    return len(wanted)
+
+
+async def unsync(db: AsyncSession, user_id: str, sources: list[str]) -> int:
+    return await _delete_synced(db, user_id, [s for s in dict.fromkeys(sources) if s in SYNC_SOURCES])
+
+
+async def get_salary(db: AsyncSession, user_id: str) -> Decimal | None:
+    settings = await db.get(models.UserSettings, user_id)
+    return settings.monthly_salary if settings is not None else None
+
+
+async def set_salary(db: AsyncSession, user_id: str, monthly_salary: float) -> None:
+    settings = await db.get(models.UserSettings, user_id)
+    if settings is None:
+        settings = models.UserSettings(user_id=user_id)
+        db.add(settings)
+    settings.monthly_salary = Decimal(str(monthly_salary))
+
+
+async def stats(db: AsyncSession, user_id: str, today: date | None = None) -> DailyStats:
+    today = today or datetime.utcnow().date()
+    current = month_start(today)
+    total = await db.scalar(select(func.coalesce(func.sum(models.DailyExpenseRollup.total), 0)).where(models.DailyExpenseRollup.user_id == user_id))
+    month_rows = (
+        await db.execute(
+            select(models.DailyExpenseRollup.category_id, models.DailyExpenseRollup.total).where(
+                models.DailyExpenseRollup.user_id == user_id, models.DailyExpenseRollup.month == current
+            )
+        )
+    ).all()
+    by_category = {category_id: amount for category_id, amount in month_rows if amount}
+    monthly = sum(by_category.values())
+    items = [
+        {"categoryId": cid, "amount": from_minor(amount), "percentage": round(amount * 100 / monthly, 1)}
+        for cid, amount in sorted(by_category.items(), key=lambda kv: kv[1], reverse=True)
+    ]
+
+    result = DailyStats(
+        total_spent=from_minor(int(total)),
+        monthly_spent=from_minor(monthly),
+        avg_daily=from_minor(monthly // today.day),
+        category_breakdown={cid: from_minor(amount) for cid, amount in by_category.items()},
+        category_breakdown_items=items,
+    )
+    salary = await get_salary(db, user_id)
+    if salary:
+        salary_minor = to_minor(salary)
+        percent = monthly * 100 / salary_minor
+        result.spent_vs_salary_percent = round(percent, 1)
+        result.remaining_salary = from_minor(salary_minor - monthly)
+        if percent >= 100:
+            result.salary_status, result.salary_message = "overspending", "You have spent more than your monthly salary."
+        elif percent >= CAUTION_PERCENT:
+            result.salary_status, result.salary_message = "caution", f"You have used {percent:.0f}% of your monthly salary."
+        else:
+            result.salary_status, result.salary_message = "safe", "Your spending is well within your salary."
+    return result
+
+
+async def rebuild_rollups(db: AsyncSession, user_id: str) -> int:
+    """Recompute a user's rollups from their expenses; returns the number of rows that were wrong."""
+    expected = _contributions(
+        await db.scalars(select(models.DailyExpense).where(models.DailyExpense.user_id == user_id)), 1
+    )
+    stored = {
+        (r.month, r.category_id): (r.total, r.count)
+        for r in await db.scalars(select(models.DailyExpenseRollup).where(models.DailyExpenseRollup.user_id == user_id))
+    }
+    wrong = sum(1 for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+    await db.execute(delete(models.DailyExpenseRollup).where(models.DailyExpenseRollup.user_id == user_id))
+    db.add_all(
+        models.DailyExpenseRollup(user_id=user_id, month=month, category_id=category_id, total=total, count=count)
+        for (month, category_id), (total, count) in expected.items()
+        if count
+    )
+    await db.flush()
+    return wrong
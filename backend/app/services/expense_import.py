@@ -0,0 +1,204 @@
+"""Streaming bulk import of trip expenses from CSV or NDJSON.
+
+The request body is consumed line by line and validated in fixed-size chunks; each
+chunk is written with a single multi-row INSERT and one aggregated ledger update,
+so memory stays bounded by the chunk size rather than the upload size.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import new_id
+from app.models import trips as models
+from app.schemas.trips import BatchImportResponse, BatchRowError, ExpenseFields
+from app.services import daily_balances, ledger
+from app.services import trips as trip_service
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+CSV_LIST_SEPARATOR = "|"
+MAX_CSV_RECORD_LINES = 100
+MIN_AMOUNT = Decimal("0.01")
+MAX_AMOUNT = Decimal("999999999999.99")  # expenses.amount is Numeric(14, 2)
+
+
+async def _lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def _csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[list[str] | csv.Error]:
+    """Parse CSV records as lines arrive; a quoted field may span lines (up to ``MAX_CSV_RECORD_LINES``)."""
+    pending: list[str] = []
+    async for line in lines:
+        if not pending and not line.strip():
+            continue
+        pending.append(line + "\n")
+        try:
+            values = next(csv.reader(pending, strict=True))
+        except csv.Error as e:
+            if str(e) == "unexpected end of data" and len(pending) < MAX_CSV_RECORD_LINES:
+                continue  # inside a quoted field; the record continues on the next line
+            yield e
+        else:
+            yield values
+        pending = []
+    if pending:
+        yield csv.Error("unterminated quoted field")
+
+
+async def iter_records(stream: AsyncIterator[bytes], content_type: str | None) -> AsyncIterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Yield ``(row_number, record, error)`` for every non-blank CSV record or NDJSON line of the body."""
+    is_csv = (content_type or "").split(";")[0].strip() in {"text/csv", "application/csv"}
+    header: list[str] | None = None
+    row = 0
+    items = _csv_rows(_lines(stream)) if is_csv else _lines(stream)
+    async for item in items:
+        if is_csv and header is None:
+            if isinstance(item, csv.Error):
+                yield 0, None, f"unparseable header: {item}"
+                return
+            header = item
+            continue
+        if isinstance(item, str) and not item.strip():
+            continue
+        row += 1
+        try:
+            if isinstance(item, csv.Error):
+                raise item
+            if is_csv:
+                record: dict[str, Any] = {k: v for k, v in zip(header, item) if v != ""}
+                if "splitAmong" in record:
+                    record["splitAmong"] = [s.strip() for s in record["splitAmong"].split(CSV_LIST_SEPARATOR) if s.strip()]
+            else:
+                record = json.loads(item)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+        except (ValueError, csv.Error) as e:
+            yield row, None, f"unparseable row: {e}"
+            continue
+        yield row, record, None
+
+
+class _Resolver:
+    def __init__(self, participants: list[models.Participant]) -> None:
+        self.ids = {p.id for p in participants}
+        self.by_name = {p.name.strip().lower(): p.id for p in participants}
+        self.all_ids = [p.id for p in participants]
+
+    def __call__(self, value: str) -> str:
+        if value in self.ids:
+            return value
+        pid = self.by_name.get(value.strip().lower())
+        if pid is None:
+            raise ValueError(f"unknown participant {value!r}")
+        return pid
+
+
+def _to_values(trip_id: str, batch_id: str, record: dict[str, Any], resolve: _Resolver) -> dict[str, Any]:
+    fields = ExpenseFields.model_validate(record)
+    if fields.amount is None or not math.isfinite(fields.amount):
+        raise ValueError("amount must be a number")
+    amount = Decimal(str(fields.amount))
+    if not MIN_AMOUNT <= amount <= MAX_AMOUNT:
+        raise ValueError(f"amount must be between {MIN_AMOUNT} and {MAX_AMOUNT}")
+    if not fields.paid_by:
+        raise ValueError("paidBy is required")
+    split = [resolve(pid) for pid in fields.split_among or []] or resolve.all_ids
+    return {
+        "id": new_id("e"),
+        "trip_id": trip_id,
+        "description": fields.description or "Expense",
+        "amount": amount,
+        "date": fields.date or datetime.utcnow(),
+        "category": fields.category or "Others",
+        "paid_by": resolve(fields.paid_by),
+        "split_among": list(dict.fromkeys(split)),
+        "is_payment": fields.is_payment,
+        "batch_id": batch_id,
+    }
+
+
+async def _write_chunk(db: AsyncSession, trip_id: str, values: list[dict[str, Any]]) -> None:
+    await db.execute(insert(models.Expense), values)
+    await ledger.apply_many(db, trip_id, (ExpenseFields(**v) for v in values), 1)
+    await db.flush()
+
+
+async def run(
+    db: AsyncSession,
+    trip: models.Trip,
+    stream: AsyncIterator[bytes],
+    content_type: str | None,
+    actor: str,
+    progress: Callable[[int], Awaitable[None]] | None = None,
+) -> BatchImportResponse:
+    """``progress``, if given, is awaited with the number of rows read after each chunk is written."""
+    batch_id = new_id("batch")
+    resolve = _Resolver(await trip_service.list_participants(db, trip.id))
+    errors: list[BatchRowError] = []
+    failed = inserted = 0
+    earliest: datetime | None = None
+    chunk: list[dict[str, Any]] = []
+
+    async for row, record, error in iter_records(stream, content_type):
+        if record is not None:
+            try:
+                values = _to_values(trip.id, batch_id, record, resolve)
+            except ValidationError as e:
+                first = e.errors()[0]
+                error = f"{'.'.join(str(p) for p in first['loc'])}: {first['msg']}"
+            except ValueError as e:
+                error = str(e)
+            else:
+                chunk.append(values)
+                earliest = values["date"] if earliest is None else min(earliest, values["date"])
+        if error is not None:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(BatchRowError(row=row, error=error))
+        if len(chunk) >= CHUNK_SIZE:
+            await _write_chunk(db, trip.id, chunk)
+            inserted += len(chunk)
+            chunk = []
+            if progress is not None:
+                await progress(row)
+
+    if chunk:
+        await _write_chunk(db, trip.id, chunk)
+        inserted += len(chunk)
+        if progress is not None:
+            await progress(row)
+
+    if inserted:
+        await daily_balances.invalidate(db, trip.id, earliest)
+        await trip_service.record_log(
+            db, trip.id, actor, "add", "expense", batch_id,
+            f"Imported {inserted} expenses", None, {"batchId": batch_id, "count": inserted}, snapshot=True,
+        )
+        trip_service.bump_version(trip)
+    await db.commit()
+    return BatchImportResponse(
+        batch_id=batch_id,
+        inserted=inserted,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
@@ -0,0 +1,71 @@
+"""Change-log encoding and trip state reconstruction.
+
+Log entries store field-level deltas: an add carries the full new record, a delete
+the full old record, and an update only the fields that changed. Every
+``SNAPSHOT_INTERVAL`` entries (and after bulk operations) a full trip snapshot is
+stored, so any past state is the nearest snapshot plus a short forward replay.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+SNAPSHOT_INTERVAL = 100
+
+TripState = dict[str, dict[str, dict[str, Any]]]
+
+
+def empty_state() -> TripState:
+    return {"participants": {}, "expenses": {}}
+
+
+def diff(previous: dict[str, Any], current: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Reduce two full records to the fields that differ (keeping ``id``)."""
+    keys = [k for k in previous.keys() | current.keys() if k != "id" and previous.get(k) != current.get(k)]
+    base = {"id": current.get("id", previous.get("id"))}
+    return {**base, **{k: previous.get(k) for k in keys}}, {**base, **{k: current.get(k) for k in keys}}
+
+
+def _prune_participant(state: TripState, participant_id: str) -> None:
+    expenses = state["expenses"]
+    for eid, expense in list(expenses.items()):
+        split = expense.get("splitAmong") or []
+        if expense.get("paidBy") != participant_id and participant_id not in split:
+            continue
+        remaining = [pid for pid in split if pid != participant_id]
+        if expense.get("paidBy") == participant_id or not remaining:
+            del expenses[eid]
+        else:
+            expense["splitAmong"] = remaining
+
+
+def forward(state: TripState, item_type: str, item_id: str, previous: Any, current: Any) -> None:
+    """Apply one log entry to ``state`` in place, in the direction it was recorded."""
+    if item_type not in ("expense", "participant") or any(isinstance(d, dict) and "batchId" in d for d in (previous, current)):
+        raise ValueError(f"cannot replay {item_type} entry {item_id}; it should be covered by a snapshot")
+    table = state["expenses" if item_type == "expense" else "participants"]
+
+    if previous is None:
+        record = copy.deepcopy(current)
+        restored = record.pop("expenses", []) if item_type == "participant" else []
+        table[item_id] = record
+        for expense in restored:
+            state["expenses"][expense["id"]] = expense
+    elif current is None:
+        table.pop(item_id, None)
+        if item_type == "participant":
+            _prune_participant(state, item_id)
+    elif item_id in table:
+        table[item_id].update({k: v for k, v in current.items() if k != "id"})
+
+
+def to_snapshot(state: TripState) -> dict[str, list[dict[str, Any]]]:
+    return {"participants": list(state["participants"].values()), "expenses": list(state["expenses"].values())}
+
+
+def from_snapshot(data: dict[str, list[dict[str, Any]]]) -> TripState:
+    return {
+        "participants": {p["id"]: dict(p) for p in data["participants"]},
+        "expenses": {e["id"]: dict(e) for e in data["expenses"]},
+    }
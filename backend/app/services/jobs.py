@@ -0,0 +1,324 @@
+"""In-process background jobs.
+
+Slow operations (expense sync, revert-all, bulk imports, ledger rebuilds) are
+persisted as ``Job`` rows and executed by a bounded pool of worker tasks on the
+server's own event loop, so no broker is needed. The row carries status, progress
+and result for ``GET /jobs/{id}``. Each process heartbeats the jobs it owns; jobs
+whose owner stopped heartbeating (a crash or restart) are failed by the sweep.
+
+Cancellation is cooperative: a queued job is cancelled outright, a running one
+stops at its next ``JobContext.progress`` checkpoint and its open transaction is
+rolled back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.serialization import validate
+from app.db.base import new_id
+from app.db.session import SessionLocal
+from app.models import jobs as models
+from app.models import trips as trip_models
+from app.models import users as user_models
+from app.schemas.jobs import Job
+from app.services import daily_expenses, expense_import, ledger
+from app.services import trips as trip_service
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+HEARTBEAT_SECONDS = 30.0
+STALE_AFTER = timedelta(seconds=3 * HEARTBEAT_SECONDS)
+UPLOAD_READ_SIZE = 64 * 1024
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    def __init__(self, job_id: str, user_id: str) -> None:
+        self.id = job_id
+        self.user_id = user_id
+
+    async def progress(self, done: int, total: int | None = None) -> None:
+        """Report progress; raises ``JobCancelled`` if the job was cancelled meanwhile."""
+        runner.report(self.id, done, total)
+        if self.id in runner.cancelling:
+            raise JobCancelled
+        async with SessionLocal() as db:
+            if await db.scalar(select(models.Job.cancel_requested).where(models.Job.id == self.id)):
+                raise JobCancelled
+
+
+Handler = Callable[[AsyncSession, JobContext, dict[str, Any]], Awaitable[Any]]
+HANDLERS: dict[str, Handler] = {}
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    def register(fn: Handler) -> Handler:
+        HANDLERS[kind] = fn
+        return fn
+
+    return register
+
+
+class JobRunner:
+    def __init__(self) -> None:
+        self.cancelling: set[str] = set()
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._owned: dict[str, tuple[int, int | None]] = {}  # queued or running here -> (progress, total)
+
+    async def start(self, workers: int) -> None:
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks, self._queue = [], None
+
+    def enqueue(self, job_id: str) -> None:
+        if self._queue is None:
+            raise RuntimeError("job runner is not started")
+        self._owned[job_id] = (0, None)
+        self._queue.put_nowait(job_id)
+
+    def report(self, job_id: str, done: int, total: int | None) -> None:
+        self._owned[job_id] = (done, total)
+
+    def progress_of(self, job_id: str) -> tuple[int, int | None] | None:
+        return self._owned.get(job_id)
+
+    def request_cancel(self, job_id: str) -> None:
+        if job_id in self._owned:
+            self.cancelling.add(job_id)
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await _run(job_id)
+            except Exception:
+                logger.exception("job %s could not be run", job_id)
+            finally:
+                self._owned.pop(job_id, None)
+                self.cancelling.discard(job_id)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            try:
+                await self.beat()
+            except Exception:
+                logger.exception("job heartbeat failed")
+
+    async def beat(self) -> None:
+        """Persist progress and heartbeats for this process's jobs, then fail orphaned ones."""
+        now = datetime.utcnow()
+        async with SessionLocal() as db:
+            for job_id, (done, total) in list(self._owned.items()):
+                await db.execute(
+                    update(models.Job)
+                    .where(models.Job.id == job_id, models.Job.status.in_(ACTIVE_STATUSES))
+                    .values(heartbeat_at=now, progress=done, total=total)
+                )
+            await db.execute(
+                update(models.Job)
+                .where(models.Job.status.in_(ACTIVE_STATUSES), models.Job.heartbeat_at < now - STALE_AFTER)
+                .values(status="failed", error="Interrupted before it finished", finished_at=now)
+            )
+            await db.commit()
+
+
+runner = JobRunner()
+
+
+async def _finish(job_id: str, status: str, result: Any = None, error: str | None = None) -> None:
+    async with SessionLocal() as db:
+        await db.execute(
+            update(models.Job)
+            .where(models.Job.id == job_id)
+            .values(status=status, result=result, error=error, finished_at=datetime.utcnow(), **_progress_values(job_id))
+        )
+        await db.commit()
+
+
+def _progress_values(job_id: str) -> dict[str, Any]:
+    reported = runner.progress_of(job_id)
+    return {"progress": reported[0], "total": reported[1]} if reported else {}
+
+
+async def _run(job_id: str) -> None:
+    async with SessionLocal() as db:
+        claimed = await db.execute(
+            update(models.Job)
+            .where(models.Job.id == job_id, models.Job.status == "queued")
+            .values(status="running", started_at=datetime.utcnow(), heartbeat_at=datetime.utcnow())
+        )
+        await db.commit()
+        job = await db.get(models.Job, job_id)
+    if job is None:
+        return
+    try:
+        if not claimed.rowcount:
+            return  # cancelled while queued
+        started = time.perf_counter()
+        try:
+            async with SessionLocal() as work:
+                result = await HANDLERS[job.kind](work, JobContext(job.id, job.user_id), dict(job.params))
+        except JobCancelled:
+            status, result, error = "cancelled", None, None
+        except HTTPException as e:
+            status, result, error = "failed", None, str(e.detail)
+        except Exception as e:
+            logger.exception("job %s (%s) failed", job.id, job.kind)
+            status, result, error = "failed", None, str(e) or type(e).__name__
+        else:
+            status, error = "succeeded", None
+        await _finish(job.id, status, result, error)
+        metrics.JOBS.inc(kind=job.kind, status=status)
+        metrics.JOB_DURATION.observe(time.perf_counter() - started, kind=job.kind)
+    finally:
+        if "upload" in job.params:
+            os.unlink(job.params["upload"])
+
+
+async def submit(db: AsyncSession, user_id: str, kind: str, params: dict[str, Any]) -> models.Job:
+    """Persist a job and hand it to this process's runner. Commits ``db``."""
+    # Concurrent submits by one user queue on their row, so the count below sees the others' jobs.
+    await db.execute(select(user_models.User.id).where(user_models.User.id == user_id).with_for_update())
+    active = await db.scalar(
+        select(func.count()).select_from(models.Job).where(models.Job.user_id == user_id, models.Job.status.in_(ACTIVE_STATUSES))
+    )
+    if active >= settings.job_max_active_per_user:
+        if "upload" in params:
+            os.unlink(params["upload"])
+        raise HTTPException(status_code=429, detail="Too many jobs in progress, try again when one finishes")
+    now = datetime.utcnow()
+    job = models.Job(
+        id=new_id("job"), user_id=user_id, kind=kind, status="queued", params=params,
+        progress=0, cancel_requested=False, created_at=now, heartbeat_at=now,
+    )
+    db.add(job)
+    await db.commit()
+    try:
+        runner.enqueue(job.id)
+    except Exception:
+        logger.exception("job %s could not be queued", job.id)
+        await _finish(job.id, "failed", error="Could not be queued")
+        if "upload" in params:
+            os.unlink(params["upload"])
+        raise HTTPException(status_code=503, detail="Background jobs are unavailable, try again later")
+    return job
+
+
+async def get_job(db: AsyncSession, user_id: str, job_id: str) -> models.Job:
+    job = await db.get(models.Job, job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def to_schema(job: models.Job) -> Job:
+    data = validate(Job, job)
+    reported = runner.progress_of(job.id) if job.status == "running" else None
+    if reported is not None:
+        data.progress, data.total = reported  # fresher than the last heartbeat when the job runs here
+    return data
+
+
+async def cancel(db: AsyncSession, job: models.Job) -> None:
+    now = datetime.utcnow()
+    dequeued = await db.execute(
+        update(models.Job)
+        .where(models.Job.id == job.id, models.Job.status == "queued")
+        .values(status="cancelled", finished_at=now)
+    )
+    if not dequeued.rowcount:
+        runner.request_cancel(job.id)
+        await db.execute(
+            update(models.Job).where(models.Job.id == job.id, models.Job.status == "running").values(cancel_requested=True)
+        )
+
+
+async def spool(stream: AsyncIterator[bytes]) -> str:
+    """Copy a request body to a temporary file a job can read after the request ends."""
+    fd, path = tempfile.mkstemp(prefix="smartsplit-upload-")
+    with os.fdopen(fd, "wb") as f:
+        async for chunk in stream:
+            await run_in_threadpool(f.write, chunk)
+    return path
+
+
+async def _read_upload(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := await run_in_threadpool(f.read, UPLOAD_READ_SIZE):
+            yield chunk
+
+
+@handler("daily_sync")
+async def _daily_sync(db: AsyncSession, job: JobContext, params: dict[str, Any]) -> dict[str, int]:
+    count = await daily_expenses.sync(db, job.user_id, params["sources"])
+    await job.progress(1, 1)  # last chance to cancel before the commit
+    await db.commit()
+    return {"count": count}
+
+
+@handler("daily_unsync")
+async def _daily_unsync(db: AsyncSession, job: JobContext, params: dict[str, Any]) -> dict[str, int]:
+    count = await daily_expenses.unsync(db, job.user_id, params["sources"])
+    await job.progress(1, 1)  # last chance to cancel before the commit
+    await db.commit()
+    return {"count": count}
+
+
+@handler("revert_all")
+async def _revert_all(db: AsyncSession, job: JobContext, params: dict[str, Any]) -> None:
+    trip = await trip_service.get_trip_for_user(db, params["tripId"], job.user_id)
+    before = await db.get(trip_models.ChangeLog, params["before"]) if params.get("before") else None
+    await trip_service.revert_all(db, trip, params["actor"], before, progress=job.progress)
+    trip_service.bump_version(trip)
+    await db.commit()
+
+
+@handler("expense_import")
+async def _expense_import(db: AsyncSession, job: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    trip = await trip_service.get_trip_for_user(db, params["tripId"], job.user_id)
+    response = await expense_import.run(
+        db, trip, _read_upload(params["upload"]), params.get("contentType"), params["actor"], progress=job.progress
+    )
+    return response.model_dump(mode="json", by_alias=True)
+
+
+@handler("ledger_rebuild")
+async def _ledger_rebuild(db: AsyncSession, job: JobContext, params: dict[str, Any]) -> dict[str, int]:
+    trip_ids = params["tripIds"]
+    drifted = 0
+    for done, trip_id in enumerate(trip_ids, start=1):
+        trip = await trip_service.get_trip_for_user(db, trip_id, job.user_id)
+        if await ledger.rebuild(db, trip_id):
+            drifted += 1
+            trip_service.bump_version(trip)
+        await db.commit()
+        await job.progress(done, len(trip_ids))
+    return {"drifted": drifted}
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import insert_for
+from app.models import trips as models
+from app.services import settlement
+
+BALANCE_COLUMNS = ("paid", "share", "received", "net")
+
+
+@dataclass(slots=True)
+class Drift:
+    trip_id: str
+    participant_id: str
+    stored: settlement.MoneyTotals
+    expected: settlement.MoneyTotals
+
+
+async def apply(db: AsyncSession, expense: models.Expense, sign: int) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) an expense's contribution to its trip's ledger."""
+    await apply_many(db, expense.trip_id, [expense], sign)
+
+
+async def apply_many(db: AsyncSession, trip_id: str, expenses: Iterable[settlement.ExpenseLike], sign: int) -> None:
+    """Add the expenses' totals to their participants' balances.
+
+    A single upsert adds to the stored columns in SQL, so concurrent writes to one
+    trip neither lose updates nor collide when creating a participant's row.
+    """
+    deltas = settlement.accumulate(expenses)
+    if not deltas:
+        return
+    balance = models.TripBalance
+    stmt = insert_for(db, balance).values(
+        [
+            {"trip_id": trip_id, "participant_id": pid, **{c: sign * getattr(t, c) for c in BALANCE_COLUMNS}}
+            for pid, t in sorted(deltas.items())  # a fixed row order, so concurrent upserts don't deadlock
+        ]
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[balance.trip_id, balance.participant_id],
+            set_={c: getattr(balance, c) + getattr(stmt.excluded, c) for c in BALANCE_COLUMNS},
+        )
+    )
+    shares = {pid: sign * t.share for pid, t in deltas.items() if t.share}
+    if shares:
+        await _adjust_owner_share(db, trip_id, sum(shares[pid] for pid in await _owner_linked(db, trip_id, list(shares))))
+
+
+async def _owner_linked(db: AsyncSession, trip_id: str, participant_ids: list[str]) -> list[str]:
+    """Which of ``participant_ids`` are linked to the trip's owner (``Participant.user_id``)."""
+    stmt = (
+        select(models.Participant.id)
+        .join(models.Trip, models.Trip.id == models.Participant.trip_id)
+        .where(
+            models.Participant.trip_id == trip_id,
+            models.Participant.id.in_(participant_ids),
+            models.Participant.user_id == models.Trip.owner_id,
+        )
+    )
+    return list(await db.scalars(stmt))
+
+
+async def _adjust_owner_share(db: AsyncSession, trip_id: str, share: int, linked: int = 0) -> None:
+    """Add to the owner's ``OwnerTripShare`` of the trip and to its count of linked participants."""
+    if not share and not linked:
+        return
+    row = models.OwnerTripShare
+    await db.execute(update(row).where(row.trip_id == trip_id).values(share=row.share + share, linked=row.linked + linked))
+
+
+async def link_owner(db: AsyncSession, trip_id: str, participant_id: str, linked: bool) -> None:
+    """Move a participant's share into (``linked=True``) or out of the owner's trip share.
+
+    Call it once the participant's link to the owner has actually changed (and been flushed).
+    """
+    sign = 1 if linked else -1
+    share = await db.scalar(
+        select(models.TripBalance.share).where(models.TripBalance.trip_id == trip_id, models.TripBalance.participant_id == participant_id)
+    )
+    await _adjust_owner_share(db, trip_id, sign * (share or 0), sign)
+
+
+async def drop_participant(db: AsyncSession, trip_id: str, participant_id: str) -> None:
+    share = await db.scalar(
+        delete(models.TripBalance)
+        .where(models.TripBalance.trip_id == trip_id, models.TripBalance.participant_id == participant_id)
+        .returning(models.TripBalance.share)
+    )
+    if await _owner_linked(db, trip_id, [participant_id]):
+        await _adjust_owner_share(db, trip_id, -(share or 0), -1)
+
+
+async def totals(db: AsyncSession, trip_id: str) -> dict[str, settlement.MoneyTotals]:
+    rows = await db.scalars(select(models.TripBalance).where(models.TripBalance.trip_id == trip_id))
+    return {r.participant_id: settlement.MoneyTotals(r.paid, r.share, r.received) for r in rows}
+
+
+async def expected_totals(db: AsyncSession, trip_id: str) -> dict[str, settlement.MoneyTotals]:
+    expenses = await db.scalars(select(models.Expense).where(models.Expense.trip_id == trip_id))
+    return settlement.accumulate(expenses)
+
+
+async def verify(db: AsyncSession, trip_id: str) -> list[Drift]:
+    stored = await totals(db, trip_id)
+    expected = await expected_totals(db, trip_id)
+    drift = []
+    for pid in sorted(stored.keys() | expected.keys()):
+        s = stored.get(pid) or settlement.MoneyTotals()
+        e = expected.get(pid) or settlement.MoneyTotals()
+        if (s.paid, s.share, s.received) != (e.paid, e.share, e.received):
+            drift.append(Drift(trip_id, pid, s, e))
+    return drift
+
+
+async def rebuild(db: AsyncSession, trip_id: str) -> list[Drift]:
+    """Recompute a trip's ledger and its owner's share from its expenses, returning the ledger drift that was corrected."""
+    drift = await verify(db, trip_id)
+    await db.execute(delete(models.TripBalance).where(models.TripBalance.trip_id == trip_id))
+    expected = await expected_totals(db, trip_id)
+    db.add_all(
+        models.TripBalance(trip_id=trip_id, participant_id=pid, paid=t.paid, share=t.share, received=t.received, net=t.net)
+        for pid, t in expected.items()
+    )
+    trip = await db.get(models.Trip, trip_id)
+    linked = list(await db.scalars(select(models.Participant.id).where(models.Participant.trip_id == trip_id, models.Participant.user_id == trip.owner_id)))
+    share = sum(expected[pid].share for pid in linked if pid in expected)
+    row = await db.get(models.OwnerTripShare, (trip.owner_id, trip_id))
+    if row is None:
+        db.add(models.OwnerTripShare(user_id=trip.owner_id, trip_id=trip_id, share=share, linked=len(linked)))
+    else:
+        row.share, row.linked = share, len(linked)
+    await db.flush()
+    return drift
+
+
+async def owner_shares(db: AsyncSession, user_id: str) -> dict[str, int]:
+    """The user's share (minor units) of each trip they own and are a participant of.
+
+    Trips where no participant is linked to the user are left out: their share is unknown, not zero.
+    """
+    row = models.OwnerTripShare
+    stmt = select(row.trip_id, row.share).where(row.user_id == user_id, row.linked > 0)
+    return {trip_id: share for trip_id, share in (await db.execute(stmt)).all()}
+
+
+async def owner_totals(db: AsyncSession, user_id: str) -> tuple[int, int]:
+    """``(trip count, summed share in minor units)`` over the trips the user owns."""
+    stmt = select(func.count(), func.coalesce(func.sum(models.OwnerTripShare.share), 0)).where(models.OwnerTripShare.user_id == user_id)
+    count, share = (await db.execute(stmt)).one()
+    return count, int(share)
@@ -0,0 +1,48 @@
+"""Keyset (seek) pagination helpers.
+
+Cursors are opaque url-safe strings encoding the sort key of the last row on the
+previous page, so each page is an index range scan regardless of how deep it is.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        decoded = []
+        for value, column in zip(values, columns):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def keyset(stmt: Select, columns: Sequence[InstrumentedAttribute], cursor: str | None, descending: bool = True) -> Select:
+    stmt = stmt.order_by(*(c.desc() for c in columns) if descending else columns)
+    if cursor:
+        key, values = tuple_(*columns), tuple_(*decode_cursor(cursor, columns))
+        stmt = stmt.where(key < values if descending else key > values)
+    return stmt
@@ -0,0 +1,71 @@
+"""Streaming export of a user's trips and trip expenses for ``GET /me/profile``.
+
+Both are read from server-side cursors (``yield_per``) and written a batch at a time,
+so memory is bounded by ``EXPORT_BATCH_SIZE`` whatever the user's history, and the
+opening bytes go out before the first query returns.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.serialization import dump_json, validate
+from app.models import trips as models
+from app.schemas.me import ProfileExpense
+from app.schemas.trips import Expense, Trip
+
+EXPORT_BATCH_SIZE = 500
+EXPENSE_COLUMNS = [getattr(models.Expense, name) for name in Expense.model_fields]
+
+
+async def _trips(db: AsyncSession, user_id: str) -> AsyncIterator[list[Trip]]:
+    stmt = select(models.Trip).where(models.Trip.owner_id == user_id).order_by(models.Trip.created_at.desc(), models.Trip.id)
+    result = await db.stream_scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for batch in result.partitions():
+        yield [validate(Trip, trip) for trip in batch]
+
+
+async def _expenses(db: AsyncSession, user_id: str) -> AsyncIterator[list[ProfileExpense]]:
+    """Expenses of every owned trip, trip by trip in date order (the ``(trip_id, date, id)`` index)."""
+    stmt = (
+        select(*EXPENSE_COLUMNS, models.Trip.name.label("trip_name"))
+        .join(models.Trip, models.Trip.id == models.Expense.trip_id)
+        .where(models.Trip.owner_id == user_id)
+        .order_by(models.Expense.trip_id, models.Expense.date, models.Expense.id)
+    )
+    result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for batch in result.partitions():
+        yield [validate(ProfileExpense, row) for row in batch]
+
+
+async def _json_array(batches: AsyncIterator[list[Any]]) -> AsyncIterator[bytes]:
+    separator = b""
+    async for batch in batches:
+        if batch:
+            yield separator + b",".join(dump_json(item) for item in batch)
+            separator = b","
+
+
+async def export_profile(db: AsyncSession, user_id: str, fmt: str) -> AsyncIterator[bytes]:
+    """Yield the profile as one ``UserProfileData`` JSON document, or as NDJSON.
+
+    NDJSON has one ``{"trip": ...}`` line per trip, then one ``{"expense": ...}`` line
+    per expense.
+    """
+    if fmt == "ndjson":
+        async for trips in _trips(db, user_id):
+            yield b"".join(b'{"trip":' + dump_json(trip) + b"}\n" for trip in trips)
+        async for expenses in _expenses(db, user_id):
+            yield b"".join(b'{"expense":' + dump_json(expense) + b"}\n" for expense in expenses)
+        return
+    yield b'{"trips":['
+    async for chunk in _json_array(_trips(db, user_id)):
+        yield chunk
+    yield b'],"expenses":['
+    async for chunk in _json_array(_expenses(db, user_id)):
+        yield chunk
+    yield b"]}"
@@ -0,0 +1,73 @@
+"""Daily sweep that records bill reminders across all users.
+
+For a given day the sweep pages by id through active items whose reminder date
+(``next_reminder``), then whose due date (``next_due``), falls on it, using the
+``(date, id)`` indexes, and inserts one ``BillReminder`` per item, due date and kind.
+Inserts ignore rows that already exist and a ``ReminderSweep`` row checkpoints the
+phase and last id after every batch, so a rerun or a restart after a crash resumes
+without duplicates. Run ``bills.rollover`` for the day first so due dates are current.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import insert_for
+from app.models import bills as models
+
+SWEEP_BATCH_SIZE = 5000
+PHASES = ("reminder", "due")
+
+
+def _insert_ignoring_duplicates(db: AsyncSession, rows: list[dict[str, Any]]) -> Insert:
+    return insert_for(db, models.BillReminder).values(rows).on_conflict_do_nothing()
+
+
+async def sweep_batch(db: AsyncSession, day: date, limit: int = SWEEP_BATCH_SIZE) -> int:
+    """Record reminders for the next batch of ``day``'s items; returns the batch size, 0 once the day is done.
+
+    The checkpoint is updated in the same transaction, so callers commit after each batch.
+    """
+    sweep = await db.get(models.ReminderSweep, day)
+    if sweep is None:
+        sweep = models.ReminderSweep(day=day, phase=PHASES[0], last_id="", reminders=0)
+        db.add(sweep)
+
+    item = models.RecurringItem
+    while sweep.finished_at is None:
+        on_day = item.next_reminder == day if sweep.phase == "reminder" else item.next_due == day
+        stmt = (
+            select(item.id, item.user_id, item.next_due, item.amount, item.auto_pay_enabled)
+            .where(on_day, item.is_active.is_(True), item.id > sweep.last_id)
+            .order_by(item.id)
+            .limit(limit)
+        )
+        if sweep.phase == "reminder":
+            stmt = stmt.where(item.reminder_days_before > 0)  # otherwise the "due" phase covers it
+        rows = (await db.execute(stmt)).all()
+        if rows:
+            now = datetime.utcnow()
+            result = await db.execute(
+                _insert_ignoring_duplicates(
+                    db,
+                    [
+                        {
+                            "item_id": item_id, "due_date": due, "kind": sweep.phase, "user_id": user_id,
+                            "remind_on": day, "amount": amount, "auto_pay": auto_pay, "created_at": now,
+                        }
+                        for item_id, user_id, due, amount, auto_pay in rows
+                    ],
+                )
+            )
+            sweep.last_id = rows[-1].id
+            sweep.reminders += result.rowcount
+            return len(rows)
+        if sweep.phase == PHASES[0]:
+            sweep.phase, sweep.last_id = PHASES[1], ""
+        else:
+            sweep.finished_at = datetime.utcnow()
+    return 0
@@ -0,0 +1,138 @@
+"""Trip settlement engine.
+
+All arithmetic happens in integer minor units (paise) so balances always sum to
+exactly zero; values are only converted back to floats when building schemas.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Protocol
+
+from app.schemas.common import MoneyStats
+from app.schemas.trips import Settlement, SettlementSummary
+
+MINOR_UNITS = 100
+_CENT = Decimal("0.01")
+
+
+class ParticipantLike(Protocol):
+    id: str
+    name: str
+
+
+class ExpenseLike(Protocol):
+    amount: Any
+    paid_by: str
+    split_among: list[str] | None
+    is_payment: bool | None
+
+
+@dataclass(slots=True)
+class MoneyTotals:
+    paid: int = 0
+    share: int = 0
+    received: int = 0
+
+    @property
+    def net(self) -> int:
+        return self.paid - self.share - self.received
+
+
+def to_minor(amount: Any) -> int:
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    return int(value.quantize(_CENT, rounding=ROUND_HALF_UP) * MINOR_UNITS)
+
+
+def from_minor(value: int) -> float:
+    return value / MINOR_UNITS
+
+
+def split_minor(amount: int, ways: int) -> list[int]:
+    """Split ``amount`` into ``ways`` parts; the first ``amount % ways`` parts get one extra paisa."""
+    base, extra = divmod(amount, ways)
+    return [base + 1 if i < extra else base for i in range(ways)]
+
+
+def expense_contributions(expense: ExpenseLike) -> list[tuple[str, int, int, int]]:
+    """Return ``(participant_id, paid, share, received)`` rows for a single expense."""
+    amount = to_minor(expense.amount)
+    rows = [(expense.paid_by, amount, 0, 0)]
+    targets = list(dict.fromkeys(expense.split_among or [])) or [expense.paid_by]
+    for pid, part in zip(targets, split_minor(amount, len(targets))):
+        if expense.is_payment:
+            rows.append((pid, 0, 0, part))
+        else:
+            rows.append((pid, 0, part, 0))
+    return rows
+
+
+def accumulate(expenses: Iterable[ExpenseLike], totals: dict[str, MoneyTotals] | None = None) -> dict[str, MoneyTotals]:
+    totals = {} if totals is None else totals
+    for expense in expenses:
+        for pid, paid, share, received in expense_contributions(expense):
+            t = totals.get(pid)
+            if t is None:
+                t = totals[pid] = MoneyTotals()
+            t.paid += paid
+            t.share += share
+            t.received += received
+    return totals
+
+
+def minimal_transfers(balances: dict[str, int]) -> list[tuple[str, str, int]]:
+    """Greedy debt netting: repeatedly match the largest debtor with the largest creditor.
+
+    Each step settles at least one side, so the plan has at most ``n - 1`` transfers and
+    runs in ``O(n log n)`` over participants. Ties are broken by participant id so the
+    output is deterministic.
+    """
+    creditors = [(-amount, pid) for pid, amount in balances.items() if amount > 0]
+    debtors = [(amount, pid) for pid, amount in balances.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers: list[tuple[str, str, int]] = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
+
+
+def summarize(participants: Sequence[ParticipantLike], totals: dict[str, MoneyTotals]) -> SettlementSummary:
+    names = {p.id: p.name for p in participants}
+    ids = list(names) + [pid for pid in totals if pid not in names]
+    balances = {pid: totals[pid].net if pid in totals else 0 for pid in ids}
+
+    settlements = [
+        Settlement(
+            from_=names.get(debtor, "Unknown"),
+            from_id=debtor,
+            to=names.get(creditor, "Unknown"),
+            to_id=creditor,
+            amount=from_minor(amount),
+        )
+        for debtor, creditor, amount in minimal_transfers(balances)
+    ]
+    stats = {
+        pid: MoneyStats(paid=from_minor(t.paid), share=from_minor(t.share), received=from_minor(t.received))
+        for pid, t in ((pid, totals.get(pid) or MoneyTotals()) for pid in ids)
+    }
+    return SettlementSummary(
+        settlements=settlements,
+        stats=stats,
+        balances={pid: from_minor(v) for pid, v in balances.items()},
+    )
+
+
+def settle(participants: Sequence[ParticipantLike], expenses: Iterable[ExpenseLike]) -> SettlementSummary:
+    return summarize(participants, accumulate(expenses))
@@ -0,0 +1,76 @@
+"""Pre-rendered public share responses.
+
+``GET /share/{token}`` is unauthenticated and tends to be hammered when a link is
+posted to a big group chat, so the serialized ``ShareTripResponse`` is kept in an
+in-process LRU keyed by token. Entries are dropped when their trip changes (see
+``trips.mark_changed``) and otherwise expire after a short TTL, which bounds staleness
+across worker processes. A render that started before the change is never served
+after it, and for a short while after a change renders read from the primary, so a
+lagging replica can't put the old share back in the cache.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.serialization import dump_json
+from app.db.session import SessionLocal, is_replica
+from app.models import trips as models
+from app.schemas.share import ShareTripResponse
+from app.schemas.trips import Participant, Trip
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedShare:
+    trip_id: str
+    version: int
+    body: bytes
+    rendered_at: float  # ``time.monotonic()`` when its reads started
+
+
+_cache: TTLCache[str, RenderedShare] = TTLCache(settings.share_cache_size, settings.share_cache_ttl_seconds)
+# When each token's trip last changed; kept as long as a cached render or a replica could predate it.
+_changed_at: TTLCache[str, float] = TTLCache(
+    maxsize=100_000, ttl=max(settings.share_cache_ttl_seconds, settings.replica_stickiness_seconds)
+)
+
+
+def cached(token: str) -> RenderedShare | None:
+    rendered = _cache.get(token)
+    if rendered is None:
+        return None
+    changed_at = _changed_at.get(token)
+    return rendered if changed_at is None or rendered.rendered_at > changed_at else None
+
+
+async def render(db: AsyncSession, token: str) -> RenderedShare | None:
+    started = time.monotonic()
+    changed_at = _changed_at.get(token)
+    if is_replica(db) and changed_at is not None and started - changed_at < settings.replica_stickiness_seconds:
+        async with SessionLocal() as primary:
+            return await render(primary, token)
+
+    trip = await db.scalar(select(models.Trip).where(models.Trip.share_token == token))
+    if trip is None:
+        return None
+    participants = await db.scalars(
+        select(models.Participant)
+        .where(models.Participant.trip_id == trip.id)
+        .order_by(models.Participant.created_at, models.Participant.id)
+    )
+    response = ShareTripResponse(trip=Trip.model_validate(trip), participants=[Participant.model_validate(p) for p in participants])
+    rendered = RenderedShare(trip_id=trip.id, version=trip.version, body=dump_json(response), rendered_at=started)
+    _cache.set(token, rendered)
+    return rendered
+
+
+def invalidate(token: str) -> None:
+    """Drop the share rendered for ``token``, and any render of it already under way."""
+    _changed_at.set(token, time.monotonic())
+    _cache.pop(token)
@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from decimal import Decimal
+from itertools import groupby
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.base import new_id
+from app.models import trips as models
+from app.schemas.common import ChangeLog, Page
+from app.schemas.trips import (
+    Expense,
+    ExpenseFields,
+    GroupedExpenses,
+    Participant,
+    Trip,
+    TripDetailsView,
+)
+from app.services import analytics as analytics_service
+from app.services import activities, daily_balances, history, ledger, pagination, settlement, share
+
+REVERT_ALL_STEPS = 3  # reconstruct, apply, mark reverted
+
+
+async def get_trip_for_user(db: AsyncSession, trip_id: str, user_id: str) -> models.Trip:
+    trip = await db.get(models.Trip, trip_id)
+    if trip is None or trip.owner_id != user_id:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    return trip
+
+
+def bump_version(trip: models.Trip) -> None:
+    """Mark the trip as changed; every mutating route calls this so cached views and ETags go stale."""
+    trip.version = models.Trip.version + 1
+    mark_changed(Session.object_session(trip), trip)
+
+
+def mark_changed(db: Session | AsyncSession, trip: models.Trip) -> None:
+    """Drop the trip's cached renderings (share page, owner's activity events) once ``db`` commits."""
+    db.info.setdefault("changed_trips", set()).add((trip.share_token, trip.owner_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_trips(session: Session) -> None:
+    for share_token, owner_id in session.info.pop("changed_trips", ()):
+        if share_token is not None:
+            share.invalidate(share_token)
+        activities.invalidate_user(owner_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_trips(session: Session) -> None:
+    session.info.pop("changed_trips", None)
+
+
+async def get_expense(db: AsyncSession, trip_id: str, expense_id: str) -> models.Expense:
+    expense = await db.get(models.Expense, expense_id)
+    if expense is None or expense.trip_id != trip_id:
+        raise HTTPException(status_code=404, detail="Expense not found")
+    return expense
+
+
+async def get_participant(db: AsyncSession, participant_id: str) -> models.Participant:
+    participant = await db.get(models.Participant, participant_id)
+    if participant is None:
+        raise HTTPException(status_code=404, detail="Participant not found")
+    return participant
+
+
+async def list_participants(db: AsyncSession, trip_id: str) -> list[models.Participant]:
+    stmt = (
+        select(models.Participant)
+        .where(models.Participant.trip_id == trip_id)
+        .order_by(models.Participant.created_at, models.Participant.id)
+    )
+    return list(await db.scalars(stmt))
+
+
+async def list_expenses(db: AsyncSession, trip_id: str) -> list[models.Expense]:
+    stmt = select(models.Expense).where(models.Expense.trip_id == trip_id).order_by(models.Expense.date, models.Expense.id)
+    return list(await db.scalars(stmt))
+
+
+async def list_logs(db: AsyncSession, trip_id: str) -> list[models.ChangeLog]:
+    stmt = select(models.ChangeLog).where(models.ChangeLog.trip_id == trip_id).order_by(models.ChangeLog.timestamp.desc(), models.ChangeLog.id.desc())
+    return list(await db.scalars(stmt))
+
+
+def actor_name(actor: dict[str, str] | None) -> str:
+    return (actor or {}).get("name") or "Someone"
+
+
+def expense_snapshot(expense: models.Expense) -> dict[str, Any]:
+    return Expense.model_validate(expense).model_dump(mode="json", by_alias=True)
+
+
+def participant_snapshot(participant: models.Participant) -> dict[str, Any]:
+    return Participant.model_validate(participant).model_dump(mode="json", by_alias=True)
+
+
+async def link_participant(db: AsyncSession, participant: models.Participant, user_id: str | None) -> None:
+    """Set whose participant this is, moving its share into or out of the trip owner's share."""
+    owner_id = (await db.get(models.Trip, participant.trip_id)).owner_id
+    was_owner = participant.user_id == owner_id
+    participant.user_id = user_id
+    await db.flush()
+    if was_owner != (user_id == owner_id):
+        await ledger.link_owner(db, participant.trip_id, participant.id, user_id == owner_id)
+
+
+async def record_log(
+    db: AsyncSession,
+    trip_id: str,
+    actor: str,
+    action: str,
+    item_type: str,
+    item_id: str,
+    description: str,
+    previous_data: Any | None = None,
+    current_data: Any | None = None,
+    snapshot: bool = False,
+) -> models.ChangeLog:
+    """Append a change-log entry, storing only the changed fields for updates.
+
+    Pass ``snapshot=True`` after operations that cannot be replayed field by field
+    (bulk imports, revert-all) so reconstruction never has to cross them.
+    """
+    if isinstance(previous_data, dict) and isinstance(current_data, dict):
+        previous_data, current_data = history.diff(previous_data, current_data)
+
+    # Concurrent changes to the trip queue on its row lock here, so each one reads the
+    # previous one's seq (no-op on SQLite, which serializes writers anyway).
+    await db.execute(select(models.Trip.id).where(models.Trip.id == trip_id).with_for_update())
+    seq = await db.scalar(select(func.coalesce(func.max(models.ChangeLog.seq), 0)).where(models.ChangeLog.trip_id == trip_id)) + 1
+    log = models.ChangeLog(
+        id=new_id("log"),
+        trip_id=trip_id,
+        actor_name=actor,
+        action=action,
+        item_type=item_type,
+        item_id=item_id,
+        description=description,
+        timestamp=datetime.utcnow(),
+        previous_data=previous_data,
+        current_data=current_data,
+        seq=seq,
+    )
+    db.add(log)
+    await db.flush()
+    if snapshot or seq % history.SNAPSHOT_INTERVAL == 0:
+        db.add(models.TripSnapshot(trip_id=trip_id, seq=seq, taken_at=log.timestamp, data=history.to_snapshot(await dump_state(db, trip_id))))
+    return log
+
+
+async def dump_state(db: AsyncSession, trip_id: str) -> history.TripState:
+    return {
+        "participants": {p.id: participant_snapshot(p) for p in await list_participants(db, trip_id)},
+        "expenses": {e.id: expense_snapshot(e) for e in await list_expenses(db, trip_id)},
+    }
+
+
+async def reconstruct(db: AsyncSession, trip_id: str, seq: int) -> history.TripState:
+    """Trip state as it was right after log entry ``seq`` (``0`` is the empty trip)."""
+    base = await db.scalar(
+        select(models.TripSnapshot)
+        .where(models.TripSnapshot.trip_id == trip_id, models.TripSnapshot.seq <= seq)
+        .order_by(models.TripSnapshot.seq.desc())
+        .limit(1)
+    )
+    state = history.from_snapshot(base.data) if base is not None else history.empty_state()
+    replay = select(models.ChangeLog).where(
+        models.ChangeLog.trip_id == trip_id,
+        models.ChangeLog.seq > (base.seq if base is not None else 0),
+        models.ChangeLog.seq <= seq,
+    )
+    for log in await db.scalars(replay.order_by(models.ChangeLog.seq)):
+        history.forward(state, log.item_type, log.item_id, log.previous_data, log.current_data)
+    return state
+
+
+async def apply_state(db: AsyncSession, trip_id: str, state: history.TripState) -> None:
+    """Write the differences between the stored trip and ``state`` through the normal ledger-aware paths."""
+    participants = {p.id: p for p in await list_participants(db, trip_id)}
+    for pid, data in state["participants"].items():
+        participant = participants.get(pid)
+        if participant is None:
+            participant = models.Participant(id=pid, trip_id=trip_id, name=data["name"])
+            db.add(participant)
+        participant.name = data["name"]
+        if participant.user_id != data.get("userId"):
+            await link_participant(db, participant, data.get("userId"))
+    await db.flush()
+
+    current = {e.id: expense_snapshot(e) for e in await list_expenses(db, trip_id)}
+    targets: dict[str, ExpenseFields | None] = {eid: None for eid in current if eid not in state["expenses"]}
+    for eid, data in state["expenses"].items():
+        if current.get(eid) != data:
+            targets[eid] = ExpenseFields.model_validate(data)
+    await write_expenses(db, trip_id, targets)
+
+    for pid, participant in participants.items():
+        if pid not in state["participants"]:
+            await ledger.drop_participant(db, trip_id, pid)
+            await db.delete(participant)
+    await db.flush()
+
+
+async def revert_all(
+    db: AsyncSession,
+    trip: models.Trip,
+    actor: str,
+    before: models.ChangeLog | None = None,
+    progress: Callable[[int, int], Awaitable[None]] | None = None,
+) -> None:
+    """Restore the trip to how it was before ``before`` (default: before its first change).
+
+    ``progress``, if given, is awaited with ``(steps done, REVERT_ALL_STEPS)`` after each step.
+    """
+    target = before.seq - 1 if before is not None else 0
+    await db.flush()
+    state = await reconstruct(db, trip.id, target)
+    if progress is not None:
+        await progress(1, REVERT_ALL_STEPS)
+    await apply_state(db, trip.id, state)
+    if progress is not None:
+        await progress(2, REVERT_ALL_STEPS)
+    await db.execute(
+        update(models.ChangeLog)
+        .where(
+            models.ChangeLog.trip_id == trip.id,
+            models.ChangeLog.seq > target,
+            models.ChangeLog.reverted_at.is_(None),
+            models.ChangeLog.action != "revert",
+        )
+        .values(reverted_at=datetime.utcnow())
+    )
+    await record_log(db, trip.id, actor, "revert", "trip", trip.id, "Reverted all changes", None, {"restoredToSeq": target}, snapshot=True)
+    if progress is not None:
+        await progress(REVERT_ALL_STEPS, REVERT_ALL_STEPS)
+
+
+def apply_expense_fields(expense: models.Expense, fields: ExpenseFields) -> None:
+    data = fields.model_dump(exclude_unset=True)
+    if "amount" in data and data["amount"] is not None:
+        data["amount"] = Decimal(str(data["amount"]))
+    for key, value in data.items():
+        setattr(expense, key, value)
+
+
+def _new_expense(trip_id: str, fields: ExpenseFields, expense_id: str | None = None) -> models.Expense:
+    return models.Expense(
+        id=expense_id or new_id("e"),
+        trip_id=trip_id,
+        description=fields.description or "Expense",
+        amount=Decimal(str(fields.amount or 0)),
+        date=fields.date or datetime.utcnow(),
+        category=fields.category or "Others",
+        paid_by=fields.paid_by or "",
+        split_among=fields.split_among,
+        is_payment=fields.is_payment,
+    )
+
+
+async def insert_expense(db: AsyncSession, trip_id: str, fields: ExpenseFields, expense_id: str | None = None) -> models.Expense:
+    expense = _new_expense(trip_id, fields, expense_id)
+    if not expense.split_among:
+        expense.split_among = [p.id for p in await list_participants(db, trip_id)]
+    db.add(expense)
+    await ledger.apply(db, expense, 1)
+    await daily_balances.invalidate(db, trip_id, expense.date)
+    return expense
+
+
+async def update_expense(db: AsyncSession, expense: models.Expense, fields: ExpenseFields) -> None:
+    previous_date = expense.date
+    await ledger.apply(db, expense, -1)
+    apply_expense_fields(expense, fields)
+    await ledger.apply(db, expense, 1)
+    await daily_balances.invalidate(db, expense.trip_id, min(previous_date, expense.date))
+
+
+async def delete_expense(db: AsyncSession, expense: models.Expense) -> None:
+    await ledger.apply(db, expense, -1)
+    await daily_balances.invalidate(db, expense.trip_id, expense.date)
+    await db.delete(expense)
+
+
+async def write_expenses(db: AsyncSession, trip_id: str, targets: dict[str, ExpenseFields | None]) -> None:
+    """Upsert (or, for ``None``, delete) many expenses by id with one ledger pass each way.
+
+    Used by bulk paths (participant removal, reverts) so their query count does not
+    grow with the number of expenses touched.
+    """
+    if not targets:
+        return
+    stmt = select(models.Expense).where(models.Expense.trip_id == trip_id, models.Expense.id.in_(list(targets)))
+    existing = {e.id: e for e in await db.scalars(stmt)}
+    dates = [e.date for e in existing.values()]
+    await ledger.apply_many(db, trip_id, existing.values(), -1)
+
+    written: list[models.Expense] = []
+    everyone: list[str] | None = None
+    for eid, fields in targets.items():
+        expense = existing.get(eid)
+        if fields is None:
+            if expense is not None:
+                await db.delete(expense)
+            continue
+        if expense is None:
+            expense = _new_expense(trip_id, fields, eid)
+            if not expense.split_among:
+                everyone = everyone or [p.id for p in await list_participants(db, trip_id)]
+                expense.split_among = everyone
+            db.add(expense)
+        else:
+            apply_expense_fields(expense, fields)
+        written.append(expense)
+        dates.append(expense.date)
+
+    await ledger.apply_many(db, trip_id, written, 1)
+    if dates:
+        await daily_balances.invalidate(db, trip_id, min(dates))
+
+
+async def delete_batch(db: AsyncSession, trip_id: str, batch_id: str) -> None:
+    stmt = select(models.Expense).where(models.Expense.trip_id == trip_id, models.Expense.batch_id == batch_id)
+    expenses = list(await db.scalars(stmt))
+    if not expenses:
+        return
+    await ledger.apply_many(db, trip_id, expenses, -1)
+    await daily_balances.invalidate(db, trip_id, min(e.date for e in expenses))
+    await db.execute(delete(models.Expense).where(models.Expense.trip_id == trip_id, models.Expense.batch_id == batch_id))
+
+
+async def remove_participant(db: AsyncSession, participant: models.Participant) -> list[dict[str, Any]]:
+    """Delete a participant, pruning them from every expense that references them.
+
+    Expenses they paid for, or that were split only with them, are deleted. Returns the
+    pre-change snapshots of every touched expense so the removal can be reverted.
+    """
+    touched: list[dict[str, Any]] = []
+    targets: dict[str, ExpenseFields | None] = {}
+    for expense in await list_expenses(db, participant.trip_id):
+        split = expense.split_among or []
+        if expense.paid_by != participant.id and participant.id not in split:
+            continue
+        touched.append(expense_snapshot(expense))
+        remaining = [pid for pid in split if pid != participant.id]
+        targets[expense.id] = None if expense.paid_by == participant.id or not remaining else ExpenseFields(split_among=remaining)
+    await write_expenses(db, participant.trip_id, targets)
+    await ledger.drop_participant(db, participant.trip_id, participant.id)
+    await db.delete(participant)
+    return touched
+
+
+async def restore_expenses(db: AsyncSession, trip_id: str, snapshots: list[dict[str, Any]]) -> None:
+    await write_expenses(db, trip_id, {s["id"]: ExpenseFields.model_validate(s) for s in snapshots})
+
+
+async def revert(db: AsyncSession, log: models.ChangeLog, actor: str) -> None:
+    if log.reverted_at is not None or log.action == "revert":
+        raise HTTPException(status_code=400, detail="Change cannot be reverted")
+
+    previous, current = log.previous_data, log.current_data
+    batch = False
+    if log.item_type == "expense":
+        existing = await db.get(models.Expense, log.item_id)
+        if log.action == "add" and isinstance(current, dict) and current.get("batchId"):
+            await delete_batch(db, log.trip_id, current["batchId"])
+            batch = True
+        elif log.action == "add":
+            if existing is not None:
+                await delete_expense(db, existing)
+        elif log.action == "update":
+            # Update logs hold only the changed fields, which cannot rebuild a deleted expense.
+            if existing is None:
+                raise HTTPException(status_code=409, detail="Expense no longer exists")
+            await restore_expenses(db, log.trip_id, [previous])
+        else:
+            await restore_expenses(db, log.trip_id, [previous])
+    elif log.item_type == "participant":
+        existing = await db.get(models.Participant, log.item_id)
+        if log.action == "add":
+            if existing is not None:
+                await remove_participant(db, existing)
+        elif log.action == "update":
+            if existing is not None and "name" in previous:
+                existing.name = previous["name"]
+            if existing is not None and "userId" in previous:
+                await link_participant(db, existing, previous["userId"])
+        elif "name" not in previous:
+            raise HTTPException(status_code=409, detail="Change cannot be reverted")
+        else:
+            participant = models.Participant(id=log.item_id, trip_id=log.trip_id, name=previous["name"])
+            db.add(participant)
+            await link_participant(db, participant, previous.get("userId"))
+            await restore_expenses(db, log.trip_id, previous.get("expenses", []))
+    else:
+        raise HTTPException(status_code=400, detail="Change cannot be reverted")
+
+    log.reverted_at = datetime.utcnow()
+    await record_log(db, log.trip_id, actor, "revert", log.item_type, log.item_id, f"Reverted: {log.description}", current, previous, snapshot=batch)
+
+
+def group_expenses(expenses: list[Expense]) -> GroupedExpenses:
+    ordered = sorted(expenses, key=lambda e: (e.date, e.id), reverse=True)
+    return [(day, list(items)) for day, items in groupby(ordered, key=lambda e: e.date.date().isoformat())]
+
+
+async def build_view(db: AsyncSession, trip: models.Trip, user_id: str, include: set[str] | None = None) -> TripDetailsView:
+    """Build the trip view; ``include`` limits it to the named sections (see ``TripViewSection``)."""
+    def wanted(*sections: str) -> bool:
+        return include is None or any(s in include for s in sections)
+
+    view = TripDetailsView(trip=Trip.model_validate(trip), share_token=trip.share_token, share_permission=trip.share_permission)
+
+    participant_rows = await list_participants(db, trip.id) if wanted("participants", "settlementData", "userShare", "analyticsData") else []
+    loads_expenses = wanted("expenses", "groupedExpenses", "analyticsData")
+    expense_rows = await list_expenses(db, trip.id) if loads_expenses else []
+    expenses = [Expense.model_validate(e) for e in expense_rows]
+
+    if wanted("participants"):
+        view.participants = [Participant.model_validate(p) for p in participant_rows]
+    if wanted("expenses"):
+        view.expenses = expenses
+    if wanted("logs"):
+        view.logs = [ChangeLog.model_validate(log) for log in await list_logs(db, trip.id)]
+    if wanted("settlementData", "userShare"):
+        settlement_data = settlement.summarize(participant_rows, await ledger.totals(db, trip.id))
+        if wanted("settlementData"):
+            view.settlement_data = settlement_data
+        if wanted("userShare"):
+            mine = [p for p in participant_rows if p.user_id == user_id]
+            view.user_share = sum(settlement_data.stats[p.id].share for p in mine) if mine else None
+    if wanted("dailyBalances"):
+        view.daily_balances = await daily_balances.series(db, trip.id, expense_rows if loads_expenses else None, trip.version)
+    if wanted("groupedExpenses"):
+        view.grouped_expenses = group_expenses(expenses)
+    if wanted("analyticsData"):
+        view.analytics_data = analytics_service.compute(participant_rows, expense_rows)
+    return view
+
+
+async def page_expenses(db: AsyncSession, trip_id: str, limit: int, cursor: str | None) -> Page[Expense]:
+    columns = (models.Expense.date, models.Expense.id)
+    stmt = pagination.keyset(select(models.Expense).where(models.Expense.trip_id == trip_id), columns, cursor)
+    rows = list(await db.scalars(stmt.limit(limit + 1)))
+    items = rows[:limit]
+    next_cursor = pagination.encode_cursor((items[-1].date, items[-1].id)) if len(rows) > limit else None
+    return Page[Expense](items=[Expense.model_validate(e) for e in items], next_cursor=next_cursor)
+
+
+async def page_logs(db: AsyncSession, trip_id: str, limit: int, cursor: str | None) -> Page[ChangeLog]:
+    columns = (models.ChangeLog.timestamp, models.ChangeLog.id)
+    stmt = pagination.keyset(select(models.ChangeLog).where(models.ChangeLog.trip_id == trip_id), columns, cursor)
+    rows = list(await db.scalars(stmt.limit(limit + 1)))
+    items = rows[:limit]
+    next_cursor = pagination.encode_cursor((items[-1].timestamp, items[-1].id)) if len(rows) > limit else None
+    return Page[ChangeLog](items=[ChangeLog.model_validate(log) for log in items], next_cursor=next_cursor)
@@ -0,0 +1,292 @@
+"""Synthetic-load benchmark for the hot read routes.
+
+Seeds a database with generated trips, then drives the ASGI app in-process (no
+server, no HTTP client) and reports latency percentiles and throughput per route
+as JSON, so runs can be diffed across commits.
+
+Usage::
+
+    python -m benchmarks.load [--database-url sqlite+aiosqlite:///./bench.db] [--users 20]
+        [--trips 5] [--participants 6] [--expenses 500] [--daily-expenses 1000] [--bills 20] [--requests 200] [--concurrency 8]
+        [--output results.json] [--no-seed]
+
+Trips are seeded per user; every request authenticates as the primary user (``me``),
+and the other users' data only adds volume to the shared tables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+PRIMARY_USER = "me"
+ROUTES = [
+    "/trips/{trip_id}/view",
+    "/daily-expenses/stats",
+    "/bills/overview",
+    "/share/{share_token}",
+    "/me/trip-shares",
+    "/me/stats",
+    "/activities/events",
+]
+
+
+async def seed(args: argparse.Namespace) -> dict[str, list[str]]:
+    """Create the schema and generated rows; returns the primary user's trip ids and share tokens."""
+    from sqlalchemy import insert
+
+    from app.db.base import Base, new_id
+    from app.db.session import SessionLocal, engine
+    from app.models import bills as bill_models
+    from app.models import daily_expenses as daily_models
+    from app.models import trips as models
+    from app.services import bills, daily_expenses, ledger
+
+    rng = random.Random(args.seed)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    start = datetime(2024, 1, 1)
+    users = [PRIMARY_USER] + [f"user{i}" for i in range(1, args.users)]
+    targets: dict[str, list[str]] = {"trip_id": [], "share_token": []}
+    async with SessionLocal() as db:
+        for user in users:
+            for t in range(args.trips):
+                trip_id, token = new_id("trip"), f"share-{user}-{t}"
+                db.add(models.Trip(id=trip_id, name=f"{user} trip {t}", owner_id=user, created_at=start, share_token=token, share_permission="view"))
+                await db.flush()
+                people = [new_id("p") for _ in range(args.participants)]
+                await db.execute(
+                    insert(models.Participant),
+                    [
+                        {"id": pid, "trip_id": trip_id, "name": f"Person {i}", "user_id": user if i == 0 else None, "created_at": start}
+                        for i, pid in enumerate(people)
+                    ],
+                )
+                if args.expenses:
+                    await db.execute(
+                        insert(models.Expense),
+                        [
+                            {
+                                "id": new_id("e"),
+                                "trip_id": trip_id,
+                                "description": f"Expense {i}",
+                                "amount": Decimal(rng.randint(100, 500_000)) / 100,
+                                "date": start + timedelta(hours=rng.randint(0, 24 * 365)),
+                                "category": rng.choice(["Food", "Travel", "Stay", "Shopping", "Others"]),
+                                "paid_by": rng.choice(people),
+                                "split_among": rng.sample(people, rng.randint(1, len(people))),
+                                "is_payment": False,
+                                "batch_id": None,
+                            }
+                            for i in range(args.expenses)
+                        ],
+                    )
+                await ledger.rebuild(db, trip_id)
+                if user == PRIMARY_USER:
+                    targets["trip_id"].append(trip_id)
+                    targets["share_token"].append(token)
+            if args.daily_expenses:
+                await db.execute(
+                    insert(daily_models.DailyExpense),
+                    [
+                        {
+                            "id": new_id("de"),
+                            "user_id": user,
+                            "description": f"Daily {i}",
+                            "amount": Decimal(rng.randint(100, 200_000)) / 100,
+                            "date": datetime.utcnow() - timedelta(hours=rng.randint(0, 24 * 730)),
+                            "category_id": rng.choice(daily_expenses.DEFAULT_CATEGORIES)[0],
+                            "payment_method": rng.choice(["Cash", "Card", "UPI"]),
+                            "source_type": "manual",
+                            "created_at": start,
+                        }
+                        for i in range(args.daily_expenses)
+                    ],
+                )
+                await daily_expenses.rebuild_rollups(db, user)
+            if args.bills:
+                today = datetime.utcnow().date()
+                schedule = [(rng.randint(1, 31), rng.randint(0, 7)) for _ in range(args.bills)]
+                await db.execute(
+                    insert(bill_models.RecurringItem),
+                    [
+                        {
+                            "id": new_id("ri"),
+                            "user_id": user,
+                            "name": f"Bill {i}",
+                            "kind": rng.choice(["bill", "subscription"]),
+                            "category": "other",
+                            "amount": Decimal(rng.randint(100, 500_000)) / 100,
+                            "due_day": due_day,
+                            "reminder_days_before": remind,
+                            "auto_pay_enabled": rng.random() < 0.5,
+                            "is_active": rng.random() < 0.9,
+                            "next_due": bills.next_due(due_day, today),
+                            "next_reminder": bills.next_due(due_day, today) - timedelta(days=remind),
+                            "created_at": start,
+                        }
+                        for i, (due_day, remind) in enumerate(schedule)
+                    ],
+                )
+                await bills.rebuild_totals(db, user)
+            await db.commit()
+    await engine.dispose()
+    return targets
+
+
+async def _call(app: Any, path: str, headers: list[tuple[bytes, bytes]]) -> tuple[int, int]:
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+    size = 0
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure(app: Any, template: str, targets: dict[str, list[str]], args: argparse.Namespace) -> dict[str, Any]:
+    from app.core.security import create_access_token
+
+    rng = random.Random(args.seed)
+    headers = [(b"authorization", f"Bearer {create_access_token(PRIMARY_USER)}".encode())]
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    remaining = args.requests
+
+    def next_path() -> str:
+        return template.format(**{k: rng.choice(v) for k, v in targets.items() if v})
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            status, _ = await _call(app, next_path(), headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    for _ in range(args.warmup):
+        await _call(app, next_path(), headers)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "route": template,
+        "requests": len(ordered),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "throughputRps": round(len(ordered) / elapsed, 1),
+        "latencyMs": {
+            "mean": round(statistics.fmean(ordered) * 1000, 3),
+            "p50": round(_percentile(ordered, 0.50) * 1000, 3),
+            "p90": round(_percentile(ordered, 0.90) * 1000, 3),
+            "p99": round(_percentile(ordered, 0.99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3),
+        },
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.no_seed:
+        from sqlalchemy import select
+
+        from app.db.session import SessionLocal
+        from app.models import trips as models
+
+        async with SessionLocal() as db:
+            rows = (await db.execute(select(models.Trip.id, models.Trip.share_token).where(models.Trip.owner_id == PRIMARY_USER))).all()
+        targets = {"trip_id": [r.id for r in rows], "share_token": [r.share_token for r in rows if r.share_token]}
+    else:
+        targets = await seed(args)
+
+    from app.main import app
+
+    routes = [r for r in ROUTES if not args.route or r in args.route]
+    return {
+        "commit": _commit(),
+        "startedAt": datetime.utcnow().isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in {"output", "database_url"}},
+        "results": [await measure(app, route, targets, args) for route in routes],
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--trips", type=int, default=5, help="trips per user")
+    parser.add_argument("--participants", type=int, default=6, help="participants per trip")
+    parser.add_argument("--expenses", type=int, default=500, help="expenses per trip")
+    parser.add_argument("--daily-expenses", type=int, default=1000, help="daily expenses per user")
+    parser.add_argument("--bills", type=int, default=20, help="recurring bills per user")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--route", action="append", choices=ROUTES, help="limit to these routes (repeatable)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-seed", action="store_true", help="reuse the data already in --database-url")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Settings are read at import time, so the URL must be in place before app modules load.
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
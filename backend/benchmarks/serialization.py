@@ -0,0 +1,117 @@
+"""Compare FastAPI's ``response_model`` path with ``ModelResponse`` on a large trip view.
+
+Usage::
+
+    python -m benchmarks.serialization [--expenses 10000] [--participants 8] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.responses import ModelResponse
+from app.models import trips as models
+from app.schemas.trips import DailyBalancePoint, Expense, Participant, Trip, TripDetailsView
+from app.services import analytics, settlement
+from app.services.trips import group_expenses
+
+
+def build_view(n_expenses: int, n_participants: int) -> TripDetailsView:
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+    trip = models.Trip(id="trip_bench", name="Bench", owner_id="me", created_at=start, currency="INR", type="trip")
+    people = [models.Participant(id=f"p{i}", trip_id=trip.id, name=f"Person {i}", created_at=start) for i in range(n_participants)]
+    ids = [p.id for p in people]
+    rows = [
+        models.Expense(
+            id=f"e{i:06d}",
+            trip_id=trip.id,
+            description=f"Expense {i}",
+            amount=Decimal(rng.randint(100, 500_000)) / 100,
+            date=start + timedelta(hours=rng.randint(0, 24 * 365)),
+            category=rng.choice(["Food", "Travel", "Stay", "Others"]),
+            paid_by=rng.choice(ids),
+            split_among=rng.sample(ids, rng.randint(1, len(ids))),
+            is_payment=False,
+        )
+        for i in range(n_expenses)
+    ]
+
+    running = dict.fromkeys(ids, 0)
+    daily: dict[str, dict[str, int]] = {}
+    for e in sorted(rows, key=lambda e: (e.date, e.id)):
+        for pid, paid, share, received in settlement.expense_contributions(e):
+            running[pid] += paid - share - received
+        daily[e.date.date().isoformat()] = dict(running)
+
+    expenses = [Expense.model_validate(e) for e in rows]
+    return TripDetailsView(
+        trip=Trip.model_validate(trip),
+        participants=[Participant.model_validate(p) for p in people],
+        expenses=expenses,
+        logs=[],
+        settlement_data=settlement.summarize(people, settlement.accumulate(rows)),
+        daily_balances=[
+            DailyBalancePoint(date=d, balances={k: settlement.from_minor(v) for k, v in b.items()}) for d, b in daily.items()
+        ],
+        grouped_expenses=group_expenses(expenses),
+        analytics_data=analytics.compute(people, rows),
+        user_share=0.0,
+    )
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--expenses", type=int, default=10_000)
+    parser.add_argument("--participants", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    view = build_view(args.expenses, args.participants)
+    field = create_model_field(name="Response_trip_view", type_=TripDetailsView, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def default_path() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=view, exclude_unset=True))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+    def model_response() -> bytes:
+        return ModelResponse(view, exclude_unset=True).body
+
+    assert json.loads(default_path()) == json.loads(model_response()), "serialized bodies differ"
+    baseline = _time(default_path, args.repeat)
+    fast = _time(model_response, args.repeat)
+    print(
+        json.dumps(
+            {
+                "expenses": args.expenses,
+                "bytes": len(model_response()),
+                "responseModelMs": round(baseline * 1000, 2),
+                "modelResponseMs": round(fast * 1000, 2),
+                "speedup": round(baseline / fast, 2),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
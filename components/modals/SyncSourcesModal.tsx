@@ -35,7 +35,7 @@ const SyncSourcesModal = ({ isOpen, onClose, onSync, onUnsync, isLoading }: Sync
     return (
         <Modal isOpen={isOpen} onClose={onClose} title="Sync Expenses from Modules">
             <div className="space-y-6">
-                <p className="text-sm text-gray-500">Select the modules you want to import your expenses from for this month.</p>
+                <p className="text-sm text-gray-500">Select the modules you want to import your expenses from for this month. Your share of each trip is the participant marked &quot;This is me&quot;.</p>
 
                 <div className="grid grid-cols-1 sm:grid-cols-2 gap-4">
                     {sources.map(source => {
@@ -91,6 +91,7 @@ const ActivityEventDetail = ({ eventId, backHref }: { eventId: string, backHref:
     const [showAddExp, setShowAddExp] = useState(false);
 
     const [newPartName, setNewPartName] = useState('');
+    const [newPartIsMe, setNewPartIsMe] = useState(false);
     const [editingPart, setEditingPart] = useState<Participant | null>(null);
     const [activeMenuId, setActiveMenuId] = useState<string | null>(null);
     const [isSavingPart, setIsSavingPart] = useState(false);
@@ -121,12 +122,13 @@ const ActivityEventDetail = ({ eventId, backHref }: { eventId: string, backHref:
         setIsSavingPart(true);
         try {
             if (editingPart) {
-                await api.updateParticipant(editingPart.id, newPartName);
+                await api.updateParticipant(editingPart.id, newPartName, isOwner ? newPartIsMe : undefined);
                 setEditingPart(null);
             } else {
-                await api.addParticipant(data.trip.id, newPartName);
+                await api.addParticipant(data.trip.id, newPartName, isOwner && newPartIsMe);
             }
             setNewPartName('');
+            setNewPartIsMe(false);
             setShowAddPart(false);
             refresh();
         } finally {
@@ -137,6 +139,7 @@ const ActivityEventDetail = ({ eventId, backHref }: { eventId: string, backHref:
     const handleEditPart = (p: Participant) => {
         setEditingPart(p);
         setNewPartName(p.name);
+        setNewPartIsMe(!!user && p.userId === user.id);
         setShowAddPart(true);
     };
 
@@ -252,7 +255,7 @@ const ActivityEventDetail = ({ eventId, backHref }: { eventId: string, backHref:
                             <div className="flex gap-2 flex-1 md:flex-none">
                                 <Button
                                     variant="secondary"
-                                    onClick={(e: React.MouseEvent) => { e.stopPropagation(); setEditingPart(null); setNewPartName(''); setShowAddPart(true); }}
+                                    onClick={(e: React.MouseEvent) => { e.stopPropagation(); setEditingPart(null); setNewPartName(''); setNewPartIsMe(false); setShowAddPart(true); }}
                                     className="flex-1 md:flex-none py-2 px-3 sm:py-3 sm:px-4 text-sm sm:text-base"
                                 >
                                     <Users size={16} /> <span className="hidden xs:inline">People</span>
@@ -632,6 +635,17 @@ const ActivityEventDetail = ({ eventId, backHref }: { eventId: string, backHref:
                             autoFocus
                             required
                         />
+                        {isOwner && (
+                            <label className="flex items-center gap-3 ml-1 text-sm font-semibold text-gray-700 dark:text-gray-300 cursor-pointer">
+                                <input
+                                    type="checkbox"
+                                    checked={newPartIsMe}
+                                    onChange={(e: React.ChangeEvent<HTMLInputElement>) => setNewPartIsMe(e.target.checked)}
+                                    className="w-4 h-4 accent-brand-blue"
+                                />
+                                This is me (counts toward your share)
+                            </label>
+                        )}
                         <Button onClick={handleAddParticipant} className="w-full py-4" isLoading={isSavingPart}> {editingPart ? "Update" : "Add"} Person </Button>
                     </div>
                 </Modal>
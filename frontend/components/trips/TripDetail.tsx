@@ -92,6 +92,7 @@ const TripDetail = ({ tripId, isSharedView = false }: { tripId: string, isShared
     const [showLogModal, setShowLogModal] = useState(false);
 
     const [newPartName, setNewPartName] = useState('');
+    const [newPartIsMe, setNewPartIsMe] = useState(false);
     const [editingPart, setEditingPart] = useState<Participant | null>(null);
     const [activeMenuId, setActiveMenuId] = useState<string | null>(null);
     const [isSavingPart, setIsSavingPart] = useState(false);
@@ -155,12 +156,13 @@ const TripDetail = ({ tripId, isSharedView = false }: { tripId: string, isShared
         setIsSavingPart(true);
         try {
             if (editingPart) {
-                await api.updateParticipant(editingPart.id, newPartName);
+                await api.updateParticipant(editingPart.id, newPartName, isOwner ? newPartIsMe : undefined);
                 setEditingPart(null);
             } else {
-                await api.addParticipant(tripId, newPartName);
+                await api.addParticipant(tripId, newPartName, isOwner && newPartIsMe);
             }
             setNewPartName('');
+            setNewPartIsMe(false);
             setShowAddPart(false);
             refresh();
         } finally {
@@ -171,6 +173,7 @@ const TripDetail = ({ tripId, isSharedView = false }: { tripId: string, isShared
     const handleEditPart = (p: Participant) => {
         setEditingPart(p);
         setNewPartName(p.name);
+        setNewPartIsMe(!!user && p.userId === user.id);
         setShowAddPart(true);
     };
 
@@ -297,7 +300,7 @@ const TripDetail = ({ tripId, isSharedView = false }: { tripId: string, isShared
                         {
                             canEdit && (
                                 <div className="flex gap-2 flex-1 md:flex-none">
-                                    <Button variant="secondary" onClick={(e: React.MouseEvent) => { e.stopPropagation(); setEditingPart(null); setNewPartName(''); setShowAddPart(true); }} className="flex-1 md:flex-none py-2 px-3 sm:py-3 sm:px-4 text-sm sm:text-base">
+                                    <Button variant="secondary" onClick={(e: React.MouseEvent) => { e.stopPropagation(); setEditingPart(null); setNewPartName(''); setNewPartIsMe(false); setShowAddPart(true); }} className="flex-1 md:flex-none py-2 px-3 sm:py-3 sm:px-4 text-sm sm:text-base">
                                         <Users size={16} /> <span className="hidden xs:inline">People</span>
                                     </Button>
                                     <Button onClick={(e: React.MouseEvent) => { e.stopPropagation(); setEditingExpense(null); setShowAddExp(true); }} className="flex-1 md:flex-none py-2 px-3 sm:py-3 sm:px-4 text-sm sm:text-base">
@@ -747,6 +750,17 @@ const TripDetail = ({ tripId, isSharedView = false }: { tripId: string, isShared
                             autoFocus
                             required
                         />
+                        {isOwner && (
+                            <label className="flex items-center gap-3 ml-1 text-sm font-semibold text-gray-700 dark:text-gray-300 cursor-pointer">
+                                <input
+                                    type="checkbox"
+                                    checked={newPartIsMe}
+                                    onChange={(e: React.ChangeEvent<HTMLInputElement>) => setNewPartIsMe(e.target.checked)}
+                                    className="w-4 h-4 accent-brand-blue"
+                                />
+                                This is me (counts toward your share)
+                            </label>
+                        )}
                         <Button onClick={handleAddParticipant} className="w-full py-4" isLoading={isSavingPart}> {editingPart ? "Update" : "Add"} Person </Button>
                     </div>
                 </Modal>
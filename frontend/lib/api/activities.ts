@@ -1,5 +1,9 @@
 import { apiRequest } from './client';
-import { Trip } from './types';
+import { ActivityEvents, Trip } from './types';
+
+export function getActivityEvents(_userId: string) {
+    return apiRequest<ActivityEvents>('/activities/events', { method: 'GET' });
+}
 
 export function getDiningEvents(_userId: string) {
     return apiRequest<Trip[]>('/activities/dining/events', { method: 'GET' });
@@ -1,8 +1,13 @@
 import { apiRequest } from './client';
-import { DailyCategory, DailyExpense, DailyStats } from './types';
+import { DailyCategory, DailyExpense, DailyStats, Page } from './types';
 
-export function getDailyExpenses(_userId: string) {
-    return apiRequest<DailyExpense[]>('/daily-expenses', { method: 'GET' });
+export const DAILY_EXPENSES_PAGE_SIZE = 50;
+
+export function getDailyExpenses(_userId: string, options: { cursor?: string | null; search?: string } = {}) {
+    const query = new URLSearchParams({ limit: String(DAILY_EXPENSES_PAGE_SIZE) });
+    if (options.cursor) query.set('cursor', options.cursor);
+    if (options.search?.trim()) query.set('q', options.search.trim());
+    return apiRequest<Page<DailyExpense>>(`/daily-expenses?${query}`, { method: 'GET' });
 }
 
 export function getDailyCategories(_userId: string) {
@@ -2,6 +2,8 @@ import { ChangeLog, DailyCategory, DailyExpense, Expense, Participant, Recurring
 
 export type { Trip, Participant, Expense, ChangeLog, Settlement, DailyExpense, DailyCategory, RecurringItem, UserData, SharePermission };
 
+export type Page<T> = { items: T[]; nextCursor?: string | null };
+
 export type ChartSlice = { label: string; value: number; color: string };
 export type ChartBar = { label: string; value: number };
 
@@ -60,6 +62,8 @@ export type AuthResponse = { user: UserData; token: string };
 
 export type UserStats = { totalTracked: number; tripCount: number };
 
+export type ActivityEvents = { dining: Trip[]; movies: Trip[]; play: Trip[] };
+
 export type UserProfileData = { trips: Trip[]; expenses: (Expense & { tripName?: string })[] };
 
 export type DailyStats = {
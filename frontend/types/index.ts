@@ -11,6 +11,7 @@ export interface Participant {
     id: string;
     tripId: string;
     name: string;
+    userId?: string | null;
 }
 
 export interface Expense {
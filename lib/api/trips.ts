@@ -37,17 +37,17 @@ export function getUserTripExpenses(_userId: string) {
     return apiRequest<Record<string, number>>('/me/trip-shares', { method: 'GET' });
 }
 
-export function addParticipant(tripId: string, name: string) {
+export function addParticipant(tripId: string, name: string, isMe = false) {
     return apiRequest<Participant>(`/trips/${encodeURIComponent(tripId)}/participants`, {
         method: 'POST',
-        body: JSON.stringify({ name })
+        body: JSON.stringify({ name, isMe })
     });
 }
 
-export function updateParticipant(participantId: string, name: string) {
+export function updateParticipant(participantId: string, name: string, isMe?: boolean) {
     return apiRequest<void>(`/participants/${encodeURIComponent(participantId)}`, {
         method: 'PATCH',
-        body: JSON.stringify({ name })
+        body: JSON.stringify({ name, isMe })
     });
 }
 